@@ -8,10 +8,6 @@ import ChatSidebar from '@/components/ChatSidebar';
 import Index from '@/pages/Index';
 import Auth from '@/pages/Auth';
 import NotFound from '@/pages/NotFound';
-import Transcripts from '@/pages/Transcripts';
-import WarRoom from '@/pages/WarRoom';
-import Analytics from '@/pages/Analytics';
-import AdminManagement from '@/pages/AdminManagement';
 import ProtectedRoute from '@/components/ProtectedRoute';
 import ManagementRoute from '@/components/ManagementRoute';
 import { AuthProvider, useAuth } from '@/contexts/auth';
@@ -19,11 +15,18 @@ import { AdminProvider } from '@/contexts/admin';
 import { AudioProvider } from '@/contexts/audio';
 import { ChatProvider } from '@/contexts/chat';
 import SidebarOpenButton from '@/components/sidebar/SidebarOpenButton';
-import TranscriptDiagnostics from '@/pages/TranscriptDiagnostics';
 import ErrorBoundary from '@/components/ErrorBoundary';
 import { ChatErrorBoundary } from '@/components/ChatErrorBoundary';
 import './App.css';
 
+// Pages outside the chat flow pull in heavy dependencies (charts, transcript
+// tooling), so they are loaded on first visit instead of at startup
+const Transcripts = React.lazy(() => import('@/pages/Transcripts'));
+const WarRoom = React.lazy(() => import('@/pages/WarRoom'));
+const Analytics = React.lazy(() => import('@/pages/Analytics'));
+const AdminManagement = React.lazy(() => import('@/pages/AdminManagement'));
+const TranscriptDiagnostics = React.lazy(() => import('@/pages/TranscriptDiagnostics'));
+
 // Initialize the query client
 const queryClient = new QueryClient({
   defaultOptions: {
@@ -50,13 +53,15 @@ const AppContent = () => {
     }
   }, [user, isLoading, isAuthPage]);
 
+  const loadingSpinner = (
+    <div className="flex items-center justify-center w-full min-h-screen bg-slate-900">
+      <div className="w-16 h-16 border-4 border-t-primary rounded-full animate-spin"></div>
+    </div>
+  );
+
   // Don't render anything while checking authentication to prevent flashes
   if (isLoading) {
-    return (
-      <div className="flex items-center justify-center w-full min-h-screen bg-slate-900">
-        <div className="w-16 h-16 border-4 border-t-primary rounded-full animate-spin"></div>
-      </div>
-    );
+    return loadingSpinner;
   }
 
   return (
@@ -70,52 +75,54 @@ const AppContent = () => {
       )}
       
       <div className="flex-1">
-        <Routes>
-          <Route path="/" element={
-            <ProtectedRoute>
-              <Index />
-            </ProtectedRoute>
-          } />
-          <Route path="/auth" element={<Auth />} />
+        <React.Suspense fallback={loadingSpinner}>
+          <Routes>
+            <Route path="/" element={
+              <ProtectedRoute>
+                <Index />
+              </ProtectedRoute>
+            } />
+            <Route path="/auth" element={<Auth />} />
           
-          <Route path="/transcripts" element={
-            <ProtectedRoute>
-              <Transcripts />
-            </ProtectedRoute>
-          } />
+            <Route path="/transcripts" element={
+              <ProtectedRoute>
+                <Transcripts />
+              </ProtectedRoute>
+            } />
           
-          <Route path="/transcript-diagnostics" element={
-            <ProtectedRoute>
-              <TranscriptDiagnostics />
-            </ProtectedRoute>
-          } />
+            <Route path="/transcript-diagnostics" element={
+              <ProtectedRoute>
+                <TranscriptDiagnostics />
+              </ProtectedRoute>
+            } />
           
-          <Route path="/warroom" element={
-            <ProtectedRoute>
-              <WarRoom />
-            </ProtectedRoute>
-          } />
+            <Route path="/warroom" element={
+              <ProtectedRoute>
+                <WarRoom />
+              </ProtectedRoute>
+            } />
           
-          <Route path="/war-room" element={
-            <ProtectedRoute>
-              <WarRoom />
-            </ProtectedRoute>
-          } />
+            <Route path="/war-room" element={
+              <ProtectedRoute>
+                <WarRoom />
+              </ProtectedRoute>
+            } />
           
-          <Route path="/analytics" element={
-            <ProtectedRoute>
-              <Analytics />
-            </ProtectedRoute>
-          } />
+            <Route path="/analytics" element={
+              <ProtectedRoute>
+                <Analytics />
+              </ProtectedRoute>
+            } />
           
-          <Route path="/admin" element={
-            <ManagementRoute>
-              <AdminManagement />
-            </ManagementRoute>
-          } />
+            <Route path="/admin" element={
+              <ManagementRoute>
+                <AdminManagement />
+              </ManagementRoute>
+            } />
           
-          <Route path="*" element={<NotFound />} />
-        </Routes>
+            <Route path="*" element={<NotFound />} />
+          </Routes>
+        </React.Suspense>
       </div>
       <Toaster />
     </div>
@@ -4,8 +4,12 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardFooter } from "@/components/ui/card";
 import { supabase } from '@/integrations/supabase/client';
 import { showSuccess, showError } from "@/utils/toastUtils";
+import { runWithConcurrency } from "@/utils/concurrency";
 import { Loader2, Tag, ChevronRight, CheckCircle2 } from 'lucide-react';
 
+// How many transcripts are tagged at the same time
+const MAX_CONCURRENT_TAGGING = 4;
+
 interface BulkAutoTagProcessorProps {
   open: boolean;
   onClose: () => void;
@@ -51,10 +55,12 @@ const BulkAutoTagProcessor: React.FC<BulkAutoTagProcessorProps> = ({
 
       setTotalTranscripts(transcripts.length);
       
-      // Process each transcript
-      for (let i = 0; i < transcripts.length; i++) {
-        const transcript = transcripts[i];
-        
+      // Process transcripts with a few in flight at once, so one
+      // transcript's tagging and update do not hold up the rest
+      let finished = 0;
+      let tagged = 0;
+      
+      await runWithConcurrency(transcripts, MAX_CONCURRENT_TAGGING, async (transcript) => {
         // Using a simple tag generation approach - in a real app you'd likely 
         // use a more sophisticated AI tagging system
         try {
@@ -66,16 +72,19 @@ const BulkAutoTagProcessor: React.FC<BulkAutoTagProcessorProps> = ({
             .update({ tags })
             .eq('id', transcript.id);
           
-          setProcessedTranscripts(i + 1);
-          setProgress(Math.round(((i + 1) / transcripts.length) * 100));
+          tagged++;
         } catch (err) {
           console.error(`Error processing transcript ${transcript.id}:`, err);
           // Continue with other transcripts even if one fails
         }
-      }
+        
+        finished++;
+        setProcessedTranscripts(finished);
+        setProgress(Math.round((finished / transcripts.length) * 100));
+      });
 
       setCompleted(true);
-      showSuccess("Tagging Complete", `Successfully tagged ${processedTranscripts} transcripts.`);
+      showSuccess("Tagging Complete", `Successfully tagged ${tagged} transcripts.`);
     } catch (err: any) {
       console.error("Error in bulk tagging:", err);
       showError("Tagging Error", err.message || "An error occurred while tagging transcripts");
@@ -28,7 +28,7 @@ import {
   CheckCircle,
   Sparkles
 } from 'lucide-react';
-import { supabase } from "@/integrations/supabase/client";
+import { addTagsToTranscripts } from "@/utils/diagnostics/transcriptManagement";
 import { formatTagForDisplay } from "@/utils/transcriptUtils";
 import { Transcript } from "@/utils/transcriptUtils";
 import TranscriptStatusIndicator from "./TranscriptStatusIndicator";
@@ -148,42 +148,20 @@ const BulkTranscriptManager: React.FC<BulkTranscriptManagerProps> = ({
       inProgress: true
     });
     
-    let successCount = 0;
-    let failCount = 0;
-    
-    for (const transcriptId of selectedTranscripts) {
-      try {
-        const transcript = transcripts.find(t => t.id === transcriptId);
-        if (!transcript) {
-          failCount++;
-          continue;
-        }
-        
-        const currentTags = transcript.tags || [];
-        const newTags = [...new Set([...currentTags, ...tagsToAdd])];
-        
-        const { error } = await supabase
-          .from('transcripts')
-          .update({ tags: newTags })
-          .eq('id', transcriptId);
-          
-        if (error) throw error;
-        
-        successCount++;
-        setProgress(prev => ({
-          ...prev,
-          completed: prev.completed + 1
-        }));
-      } catch (error) {
-        console.error(`Error applying tags to transcript ${transcriptId}:`, error);
-        failCount++;
-        setProgress(prev => ({
-          ...prev,
-          failed: prev.failed + 1
-        }));
-      }
+    // One request merges the tags into every selected transcript
+    const { success, updatedIds, error } = await addTagsToTranscripts(selectedTranscripts, tagsToAdd);
+    if (!success) {
+      console.error('Error applying tags to transcripts:', error);
     }
     
+    const successCount = updatedIds.length;
+    const failCount = selectedTranscripts.length - successCount;
+    setProgress(prev => ({
+      ...prev,
+      completed: successCount,
+      failed: failCount
+    }));
+    
     setIsActionRunning(false);
     setProgress(prev => ({
       ...prev,
@@ -219,36 +197,20 @@ const BulkTranscriptManager: React.FC<BulkTranscriptManagerProps> = ({
       inProgress: true
     });
     
-    let successCount = 0;
-    let failCount = 0;
-    
     // Import dynamically to reduce initial load time
-    const { reprocessTranscript } = await import('@/utils/diagnostics/reprocessTranscripts');
+    const { reprocessTranscripts } = await import('@/utils/diagnostics/reprocessTranscripts');
     
-    for (const transcriptId of selectedTranscripts) {
-      try {
-        const result = await reprocessTranscript(transcriptId);
-        
-        if (result) {
-          successCount++;
-        } else {
-          failCount++;
-        }
-        
+    // Reprocess a few transcripts at a time, updating progress as each finishes
+    const { success: successCount, failed: failCount } = await reprocessTranscripts(
+      selectedTranscripts,
+      (_transcriptId, result) => {
         setProgress(prev => ({
           ...prev,
           completed: result ? prev.completed + 1 : prev.completed,
           failed: !result ? prev.failed + 1 : prev.failed
         }));
-      } catch (error) {
-        console.error(`Error reprocessing transcript ${transcriptId}:`, error);
-        failCount++;
-        setProgress(prev => ({
-          ...prev,
-          failed: prev.failed + 1
-        }));
       }
-    }
+    );
     
     setIsActionRunning(false);
     setProgress(prev => ({
@@ -10,6 +10,11 @@ import { motion } from 'framer-motion';
 import { useIsMobile } from '@/hooks/ui/use-mobile';
 import { useAuth } from '@/contexts/auth/AuthContext';
 
+// Top queries are aggregated over days or weeks and barely move minute to
+// minute, so a fetched list is reused for five minutes (across remounts and
+// every instance of this component) before it is requested again
+const POPULAR_QUERIES_TTL_MS = 5 * 60 * 1000;
+
 interface PopularQuestionsProps {
   onSelectQuestion: (question: string) => void;
   className?: string;
@@ -41,7 +46,8 @@ const PopularQuestions: React.FC<PopularQuestionsProps> = ({
       
       return data || [];
     },
-    refetchInterval: 60000, // Refetch every minute
+    staleTime: POPULAR_QUERIES_TTL_MS,
+    refetchInterval: POPULAR_QUERIES_TTL_MS,
     enabled: isAuthenticated, // Only fetch if user is authenticated
   });
 
@@ -11,7 +11,8 @@ import {
   generateStoragePath, 
   generatePublicUrl,
   detectSourceCategory,
-  formatFileSize
+  formatFileSize,
+  getFileExtension
 } from "@/utils/fileUtils";
 import { Progress } from "@/components/ui/progress";
 import { logger } from "@/utils/logger";
@@ -70,7 +71,7 @@ const TranscriptUploader = ({
     if (files.length > 0) {
       // Check for allowed file types
       const file = files[0];
-      const fileExtension = file.name.split('.').pop()?.toLowerCase();
+      const fileExtension = getFileExtension(file.name);
       
       if (!fileExtension || !['txt', 'pdf', 'doc', 'docx'].includes(fileExtension)) {
         toast({
@@ -123,8 +123,9 @@ const UnifiedInputBar: React.FC<UnifiedInputBarProps> = ({
       const base64Audio = await new Promise<string>((resolve) => {
         reader.onloadend = () => {
           const base64String = reader.result as string;
-          // Remove the data URL prefix (e.g., "data:audio/webm;base64,")
-          const base64 = base64String.split(',')[1];
+          // Remove the data URL prefix (e.g., "data:audio/webm;base64,"),
+          // scanning only up to the first comma instead of splitting the payload
+          const base64 = base64String.slice(base64String.indexOf(',') + 1);
           resolve(base64);
         };
       });
@@ -30,12 +30,17 @@ import {
   X
 } from "lucide-react";
 import { supabase } from "@/integrations/supabase/client";
+import { addTagsToTranscripts } from "@/utils/diagnostics/transcriptManagement";
+import { runWithConcurrency } from "@/utils/concurrency";
 import { useToast } from "@/hooks/ui/use-toast";
 import TranscriptUploader from "./TranscriptUploader";
 import TranscriptStatusIndicator from "./TranscriptStatusIndicator";
 import { formatTagForDisplay, getSourceCategories } from "@/utils/transcriptUtils";
 import { cn } from "@/lib/utils";
 
+// Summaries generated at once when summarizing a selection of transcripts
+const MAX_CONCURRENT_SUMMARIES = 2;
+
 interface Transcript {
   id: string;
   title: string;
@@ -177,42 +182,20 @@ const UnifiedTranscriptManager: React.FC<UnifiedTranscriptManagerProps> = ({
       inProgress: true
     });
     
-    let successCount = 0;
-    let failCount = 0;
-    
-    for (const transcriptId of selectedTranscripts) {
-      try {
-        const transcript = transcripts.find(t => t.id === transcriptId);
-        if (!transcript) {
-          failCount++;
-          continue;
-        }
-        
-        const currentTags = transcript.tags || [];
-        const newTags = [...new Set([...currentTags, ...tagsToAdd])];
-        
-        const { error } = await supabase
-          .from('transcripts')
-          .update({ tags: newTags })
-          .eq('id', transcriptId);
-          
-        if (error) throw error;
-        
-        successCount++;
-        setProgress(prev => ({
-          ...prev,
-          completed: prev.completed + 1
-        }));
-      } catch (error) {
-        console.error(`Error applying tags to transcript ${transcriptId}:`, error);
-        failCount++;
-        setProgress(prev => ({
-          ...prev,
-          failed: prev.failed + 1
-        }));
-      }
+    // One request merges the tags into every selected transcript
+    const { success, updatedIds, error } = await addTagsToTranscripts(selectedTranscripts, tagsToAdd);
+    if (!success) {
+      console.error('Error applying tags to transcripts:', error);
     }
     
+    const successCount = updatedIds.length;
+    const failCount = selectedTranscripts.length - successCount;
+    setProgress(prev => ({
+      ...prev,
+      completed: successCount,
+      failed: failCount
+    }));
+    
     setIsActionRunning(false);
     setProgress(prev => ({
       ...prev,
@@ -255,36 +238,20 @@ const UnifiedTranscriptManager: React.FC<UnifiedTranscriptManagerProps> = ({
       inProgress: true
     });
     
-    let successCount = 0;
-    let failCount = 0;
-    
     // Import dynamically to reduce initial load time
-    const { reprocessTranscript } = await import('@/utils/diagnostics/reprocessTranscripts');
+    const { reprocessTranscripts } = await import('@/utils/diagnostics/reprocessTranscripts');
     
-    for (const transcriptId of selectedTranscripts) {
-      try {
-        const result = await reprocessTranscript(transcriptId);
-        
-        if (result) {
-          successCount++;
-        } else {
-          failCount++;
-        }
-        
+    // Reprocess a few transcripts at a time, updating progress as each finishes
+    const { success: successCount, failed: failCount } = await reprocessTranscripts(
+      selectedTranscripts,
+      (_transcriptId, result) => {
         setProgress(prev => ({
           ...prev,
           completed: result ? prev.completed + 1 : prev.completed,
           failed: !result ? prev.failed + 1 : prev.failed
         }));
-      } catch (error) {
-        console.error(`Error reprocessing transcript ${transcriptId}:`, error);
-        failCount++;
-        setProgress(prev => ({
-          ...prev,
-          failed: prev.failed + 1
-        }));
       }
-    }
+    );
     
     setIsActionRunning(false);
     setProgress(prev => ({
@@ -331,11 +298,13 @@ const UnifiedTranscriptManager: React.FC<UnifiedTranscriptManagerProps> = ({
     let successCount = 0;
     let failCount = 0;
     
-    for (const transcriptId of selectedTranscripts) {
+    // Keep a couple of summary model calls in flight at once rather than
+    // waiting on each one in turn
+    await runWithConcurrency(selectedTranscripts, MAX_CONCURRENT_SUMMARIES, async (transcriptId) => {
       try {
         // Call the edge function to generate a summary
         const { error } = await supabase.functions.invoke('generate-transcript-summary', {
-          body: { transcript_id: transcriptId }
+          body: { transcriptId }
         });
         
         if (error) throw error;
@@ -353,7 +322,7 @@ const UnifiedTranscriptManager: React.FC<UnifiedTranscriptManagerProps> = ({
           failed: prev.failed + 1
         }));
       }
-    }
+    });
     
     setIsActionRunning(false);
     setProgress(prev => ({
@@ -32,9 +32,10 @@ export function ReprocessingTab() {
   const fetchTranscripts = async () => {
     setIsLoading(true);
     try {
+      // The tab only shows status, so the (large) content column is not fetched
       const { data, error } = await supabase
         .from('transcripts')
-        .select('id, title, is_processed, metadata, content')
+        .select('id, title, is_processed, metadata')
         .order('created_at', { ascending: false });
 
       if (error) {
@@ -18,7 +18,7 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { Separator } from '@/components/ui/separator';
 import { InfoIcon, ChevronRight, ChevronDown } from 'lucide-react';
 import { useToast } from '@/components/ui/use-toast';
-import { TranscriptChunk } from '@/hooks/transcripts/useTranscriptDetails';
+import { TranscriptChunk, TRANSCRIPT_CHUNK_COLUMNS } from '@/hooks/transcripts/useTranscriptDetails';
 
 interface TranscriptChunksProps {
   transcriptId: string;
@@ -70,7 +70,7 @@ export const TranscriptChunks: React.FC<TranscriptChunksProps> = ({ transcriptId
 
         const { data, error } = await supabase
           .from('chunks')
-          .select('*')
+          .select(TRANSCRIPT_CHUNK_COLUMNS)
           .eq('transcript_id', transcriptId);
 
         if (error) {
@@ -121,22 +121,15 @@ const MessageControls: React.FC<MessageControlsProps> = ({ content, citation, is
   };
 
   const base64ToBlob = (base64: string, mimeType: string) => {
+    // Decode straight into one byte array in a single pass, rather than
+    // copying 512-char slices into intermediate arrays first
     const byteCharacters = atob(base64);
-    const byteArrays = [];
-
-    for (let offset = 0; offset < byteCharacters.length; offset += 512) {
-      const slice = byteCharacters.slice(offset, offset + 512);
-      const byteNumbers = new Array(slice.length);
-      
-      for (let i = 0; i < slice.length; i++) {
-        byteNumbers[i] = slice.charCodeAt(i);
-      }
-      
-      const byteArray = new Uint8Array(byteNumbers);
-      byteArrays.push(byteArray);
+    const bytes = new Uint8Array(byteCharacters.length);
+    for (let i = 0; i < byteCharacters.length; i++) {
+      bytes[i] = byteCharacters.charCodeAt(i);
     }
 
-    return new Blob(byteArrays, { type: mimeType });
+    return new Blob([bytes], { type: mimeType });
   };
 
   if (isLoading) {
@@ -193,31 +193,31 @@ export const ChatProvider: React.FC<ChatProviderProps> = ({
     aiResponse: { content: string; source: 'gemini' | 'system'; citation?: string[] }
   ) => {
     try {
-      // Create user message
-      const { error: userMsgError } = await supabase
+      // Store both messages in one multi-row insert instead of two round
+      // trips. The database stamps created_at per row in insert order, so the
+      // question still sorts before the reply.
+      const { error: insertError } = await supabase
         .from('messages')
-        .insert({
-          conversation_id: convId,
-          user_id: userId,
-          content: userMessage,
-          role: 'user',
-        });
-        
-      if (userMsgError) throw userMsgError;
-      
-      // Create AI message
-      const { error: aiMsgError } = await supabase
-        .from('messages')
-        .insert({
-          conversation_id: convId,
-          user_id: userId,
-          content: aiResponse.content,
-          role: 'assistant',
-          source: aiResponse.source,
-          citation: aiResponse.citation,
-        });
+        .insert([
+          {
+            conversation_id: convId,
+            user_id: userId,
+            content: userMessage,
+            role: 'user',
+            source: null,
+            citation: null,
+          },
+          {
+            conversation_id: convId,
+            user_id: userId,
+            content: aiResponse.content,
+            role: 'assistant',
+            source: aiResponse.source,
+            citation: aiResponse.citation ?? null,
+          },
+        ]);
         
-      if (aiMsgError) throw aiMsgError;
+      if (insertError) throw insertError;
     } catch (error) {
       console.error('Error saving messages:', error);
       throw error;
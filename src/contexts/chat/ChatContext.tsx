@@ -209,34 +209,35 @@ export const ChatProvider: React.FC<ChatProviderProps> = ({
     aiResponse: { content: string; source: 'gemini' | 'system'; citation?: string[]; metadata?: any }
   ) => {
     try {
-      // Create user message
-      const { error: userMsgError } = await supabase
+      // Store both messages in one multi-row insert instead of two round
+      // trips. The database stamps created_at per row in insert order, so the
+      // question still sorts before the reply.
+      const { error: insertError } = await supabase
         .from('messages')
-        .insert({
-          conversation_id: convId,
-          user_id: userId,
-          content: userMessage,
-          is_user: true, // Keep for backward compatibility
-          role: 'user',
-        });
-        
-      if (userMsgError) throw userMsgError;
-      
-      // Create AI message
-      const { error: aiMsgError } = await supabase
-        .from('messages')
-        .insert({
-          conversation_id: convId,
-          user_id: userId,
-          content: aiResponse.content,
-          is_user: false, // Keep for backward compatibility
-          role: 'assistant',
-          source: aiResponse.source,
-          citation: aiResponse.citation,
-          metadata: aiResponse.metadata,
-        });
+        .insert([
+          {
+            conversation_id: convId,
+            user_id: userId,
+            content: userMessage,
+            is_user: true, // Keep for backward compatibility
+            role: 'user',
+            source: null,
+            citation: null,
+            metadata: null,
+          },
+          {
+            conversation_id: convId,
+            user_id: userId,
+            content: aiResponse.content,
+            is_user: false, // Keep for backward compatibility
+            role: 'assistant',
+            source: aiResponse.source,
+            citation: aiResponse.citation ?? null,
+            metadata: aiResponse.metadata ?? null,
+          },
+        ]);
         
-      if (aiMsgError) throw aiMsgError;
+      if (insertError) throw insertError;
     } catch (error) {
       logger.error('ChatContext', 'Error saving messages', error);
       // Don't throw - just log the error to prevent retry loop
@@ -288,7 +288,9 @@ export function useAudioManager(options: AudioManagerOptions = {}) {
       const reader = new FileReader();
       const audioBase64Promise = new Promise<string>((resolve) => {
         reader.onloadend = () => {
-          const base64 = (reader.result as string).split(',')[1];
+          // Drop the data URL prefix by scanning only up to the first comma
+          const dataUrl = reader.result as string;
+          const base64 = dataUrl.slice(dataUrl.indexOf(',') + 1);
           resolve(base64);
         };
       });
@@ -337,22 +339,15 @@ export function useAudioManager(options: AudioManagerOptions = {}) {
    * Convert base64 string to Blob
    */
   const base64ToBlob = (base64: string, mimeType: string): Blob => {
+    // Decode straight into one byte array in a single pass, rather than
+    // copying 512-char slices into intermediate arrays first
     const byteCharacters = atob(base64);
-    const byteArrays = [];
-
-    for (let offset = 0; offset < byteCharacters.length; offset += 512) {
-      const slice = byteCharacters.slice(offset, offset + 512);
-      const byteNumbers = new Array(slice.length);
-      
-      for (let i = 0; i < slice.length; i++) {
-        byteNumbers[i] = slice.charCodeAt(i);
-      }
-      
-      const byteArray = new Uint8Array(byteNumbers);
-      byteArrays.push(byteArray);
+    const bytes = new Uint8Array(byteCharacters.length);
+    for (let i = 0; i < byteCharacters.length; i++) {
+      bytes[i] = byteCharacters.charCodeAt(i);
     }
 
-    return new Blob(byteArrays, { type: mimeType });
+    return new Blob([bytes], { type: mimeType });
   };
 
   // Method to set source directly - needed for compatibility with some components
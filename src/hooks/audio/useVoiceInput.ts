@@ -81,7 +81,9 @@ export function useVoiceInput() {
       const reader = new FileReader();
       const audioBase64Promise = new Promise<string>((resolve) => {
         reader.onloadend = () => {
-          const base64 = (reader.result as string).split(',')[1];
+          // Drop the data URL prefix by scanning only up to the first comma
+          const dataUrl = reader.result as string;
+          const base64 = dataUrl.slice(dataUrl.indexOf(',') + 1);
           resolve(base64);
         };
       });
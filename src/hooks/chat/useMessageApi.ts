@@ -90,31 +90,31 @@ export function useMessageApi({ userId, conversationId }: UseMessageApiProps) {
         throw new Error('Missing required data for saving messages');
       }
       
-      // Create user message
-      const { error: userMsgError } = await supabase
+      // Store both messages in one multi-row insert instead of two round
+      // trips. The database stamps created_at per row in insert order, so the
+      // question still sorts before the reply.
+      const { error: insertError } = await supabase
         .from('messages')
-        .insert({
-          conversation_id: convId,
-          user_id: userId,
-          content: userMessage,
-          role: 'user',
-        });
+        .insert([
+          {
+            conversation_id: convId,
+            user_id: userId,
+            content: userMessage,
+            role: 'user',
+            source: null,
+            citation: null,
+          },
+          {
+            conversation_id: convId,
+            user_id: userId,
+            content: aiMessage.content,
+            role: 'assistant',
+            source: aiMessage.source,
+            citation: aiMessage.citation ?? null,
+          },
+        ]);
         
-      if (userMsgError) throw userMsgError;
-      
-      // Create AI message
-      const { error: aiMsgError } = await supabase
-        .from('messages')
-        .insert({
-          conversation_id: convId,
-          user_id: userId,
-          content: aiMessage.content,
-          role: 'assistant',
-          source: aiMessage.source,
-          citation: aiMessage.citation,
-        });
-        
-      if (aiMsgError) throw aiMsgError;
+      if (insertError) throw insertError;
       
       return { success: true };
     } catch (error) {
@@ -31,6 +31,10 @@ export interface TranscriptChunk {
   created_at?: string;
 }
 
+// The chunk columns a TranscriptChunk holds, selected explicitly so the
+// full-text search vector stored with each chunk is not sent to the browser
+export const TRANSCRIPT_CHUNK_COLUMNS = 'id, content, transcript_id, chunk_type, topic, created_at, metadata';
+
 export function useTranscriptDetails(transcriptId: string | null) {
   const [transcript, setTranscript] = useState<any | null>(null);
   const [chunks, setChunks] = useState<TranscriptChunk[]>([]);
@@ -88,7 +92,7 @@ export function useTranscriptDetails(transcriptId: string | null) {
       
       const { data, error: chunksError } = await supabase
         .from('chunks')
-        .select('*')
+        .select(TRANSCRIPT_CHUNK_COLUMNS)
         .eq('transcript_id', transcriptId)
         .order('metadata->position', { ascending: true });
         
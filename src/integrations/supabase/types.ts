@@ -114,6 +114,7 @@ export type Database = {
         Row: {
           chunk_type: string
           content: string
+          content_tsv: unknown | null
           created_at: string | null
           id: string
           metadata: Json | null
@@ -213,6 +214,7 @@ export type Database = {
       embeddings: {
         Row: {
           content: string
+          content_tsv: unknown | null
           created_at: string
           embedding: string | null
           feedback_count: number | null
@@ -388,6 +390,7 @@ export type Database = {
       }
       transcript_summaries: {
         Row: {
+          content_hash: string | null
           created_at: string
           id: string
           key_points: Json | null
@@ -398,6 +401,7 @@ export type Database = {
           updated_at: string
         }
         Insert: {
+          content_hash?: string | null
           created_at?: string
           id?: string
           key_points?: Json | null
@@ -408,6 +412,7 @@ export type Database = {
           updated_at?: string
         }
         Update: {
+          content_hash?: string | null
           created_at?: string
           id?: string
           key_points?: Json | null
@@ -498,6 +503,10 @@ export type Database = {
       [_ in never]: never
     }
     Functions: {
+      add_tags_to_transcripts: {
+        Args: { transcript_ids: string[]; new_tags: string[] }
+        Returns: string[]
+      }
       binary_quantize: {
         Args: { "": string } | { "": unknown }
         Returns: unknown
@@ -565,6 +574,22 @@ export type Database = {
         Args: { "": string } | { "": unknown } | { "": unknown }
         Returns: string
       }
+      search_embeddings_by_text: {
+        Args: {
+          search_query: string
+          filter_metadata?: Json
+          match_count?: number
+          match_threshold?: number
+          use_feedback?: boolean
+        }
+        Returns: {
+          id: string
+          content: string
+          metadata: Json
+          feedback_count: number
+          score: number
+        }[]
+      }
       sparsevec_out: {
         Args: { "": unknown }
         Returns: unknown
@@ -193,14 +193,20 @@ const Analytics = () => {
   };
   
   const generateDailyQueryVolumeData = (): DataPoint[] => {
-    const dailyData: Record<string, number> = {};
+    // Bucket by local midnight timestamp so the x-axis sorts numerically and
+    // only one label per day is formatted, instead of formatting every row
+    // and re-parsing the labels inside the sort comparator
+    const dailyData = new Map<number, number>();
     analyticsData.forEach(item => {
-      const date = new Date(item.created_at).toLocaleDateString([], { year: 'numeric', month: 'short', day: 'numeric' });
-      dailyData[date] = (dailyData[date] || 0) + 1;
+      const day = new Date(item.created_at).setHours(0, 0, 0, 0);
+      dailyData.set(day, (dailyData.get(day) || 0) + 1);
     });
-    return Object.entries(dailyData)
-      .sort((a, b) => new Date(a[0]).getTime() - new Date(b[0]).getTime())
-      .map(([date, count]) => ({ date, queries: count }));
+    return Array.from(dailyData.keys())
+      .sort((a, b) => a - b)
+      .map(day => ({
+        date: new Date(day).toLocaleDateString([], { year: 'numeric', month: 'short', day: 'numeric' }),
+        queries: dailyData.get(day)!
+      }));
   };
   
   const getPieData = (generatorFn: () => { name: string; value: number }[]): DataPoint[] => {
@@ -258,20 +264,19 @@ const Analytics = () => {
       return;
     }
     
-    // Convert to CSV
+    // Convert to CSV. Each row is handed to the Blob as its own part, so a
+    // full export is never concatenated into one large string in memory
     const headers = Object.keys(dataToExport[0]);
-    const csvContent = [
-      headers.join(','),
-      ...dataToExport.map(row => 
-        headers.map(header => {
-          const cell = row[header]?.toString() || '';
-          return `"${cell.replace(/"/g, '""')}"`;
-        }).join(',')
-      )
-    ].join('\n');
+    const csvParts = [headers.join(',')];
+    for (const row of dataToExport) {
+      csvParts.push('\n' + headers.map(header => {
+        const cell = row[header]?.toString() || '';
+        return `"${cell.replace(/"/g, '""')}"`;
+      }).join(','));
+    }
     
     // Create download link
-    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    const blob = new Blob(csvParts, { type: 'text/csv;charset=utf-8;' });
     const url = URL.createObjectURL(blob);
     const link = document.createElement('a');
     link.setAttribute('href', url);
@@ -280,6 +285,9 @@ const Analytics = () => {
     document.body.appendChild(link);
     link.click();
     document.body.removeChild(link);
+    // Revoke after the click has been handled; revoking synchronously can
+    // cancel the download in some browsers
+    setTimeout(() => URL.revokeObjectURL(url), 0);
     
     toast({ title: "Export successful", description: `Data exported to ${filename}` });
   };
@@ -17,6 +17,7 @@ import TranscriptDetailProgress from "@/components/TranscriptDetailProgress";
 import TagFilter from "@/components/TagFilter";
 import BulkTranscriptManager from "@/components/BulkTranscriptManager";
 import { supabase } from "@/integrations/supabase/client";
+import { addTagsToTranscripts } from "@/utils/diagnostics/transcriptManagement";
 import { useAuth } from '@/contexts/auth/AuthContext';
 import { useAdmin } from '@/contexts/admin/AdminContext';
 import { showSuccess, showError, showWarning } from "@/utils/toastUtils";
@@ -322,20 +323,14 @@ const TranscriptsPage = () => {
       return;
     }
     try {
-      let successCount = 0;
-      for (const transcriptId of selectedTranscripts) {
-        const transcript = transcripts.find(t => t.id === transcriptId);
-        if (!transcript) continue;
-        const currentTags = transcript.tags || [];
-        const newTags = [...new Set([...currentTags, ...bulkTags])];
-        const {
-          error
-        } = await supabase.from("transcripts").update({
-          tags: newTags
-        }).eq("id", transcriptId);
-        if (error) throw error;
-        successCount++;
-      }
+      // One request merges the tags into every selected transcript
+      const {
+        success,
+        updatedIds,
+        error
+      } = await addTagsToTranscripts(selectedTranscripts, bulkTags);
+      if (!success) throw new Error(error);
+      const successCount = updatedIds.length;
 
       // Update local state
       await fetchTranscripts();
@@ -522,41 +517,20 @@ const TranscriptsPage = () => {
       inProgress: true
     });
 
-    const { reprocessTranscript } = await import('@/utils/diagnostics/reprocessTranscripts');
-    
-    let successCount = 0;
-    let failCount = 0;
+    const { reprocessTranscripts } = await import('@/utils/diagnostics/reprocessTranscripts');
 
-    // Process transcripts one by one to avoid overwhelming the server
-    for (const transcript of unprocessedTranscripts) {
-      try {
-        const result = await reprocessTranscript(transcript.id);
-        
-        if (result) {
-          successCount++;
-          setReprocessingProgress(prev => ({
-            ...prev,
-            completed: prev.completed + 1
-          }));
-        } else {
-          failCount++;
-          setReprocessingProgress(prev => ({
-            ...prev,
-            failed: prev.failed + 1
-          }));
-        }
-      } catch (error) {
-        console.error(`Error reprocessing transcript ${transcript.id}:`, error);
-        failCount++;
+    // Reprocess a few transcripts at a time; the helper bounds concurrency so
+    // the server is not overwhelmed
+    const { success: successCount, failed: failCount } = await reprocessTranscripts(
+      unprocessedTranscripts.map(transcript => transcript.id),
+      (_transcriptId, result) => {
         setReprocessingProgress(prev => ({
           ...prev,
-          failed: prev.failed + 1
+          completed: result ? prev.completed + 1 : prev.completed,
+          failed: !result ? prev.failed + 1 : prev.failed
         }));
       }
-
-      // Add a small delay between requests
-      await new Promise(resolve => setTimeout(resolve, 1000));
-    }
+    );
 
     setIsReprocessingAll(false);
     setReprocessingProgress(prev => ({
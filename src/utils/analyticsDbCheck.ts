@@ -1,7 +1,23 @@
 
 import { supabase } from '@/integrations/supabase/client';
 
-export async function checkAnalyticsTable() {
+// The table only has to be validated once per session; concurrent callers
+// share the in-flight check and a failed check is retried next time
+let analyticsTableCheck: Promise<boolean> | null = null;
+
+export function checkAnalyticsTable(): Promise<boolean> {
+  if (!analyticsTableCheck) {
+    analyticsTableCheck = validateAnalyticsTable().then(success => {
+      if (!success) {
+        analyticsTableCheck = null;
+      }
+      return success;
+    });
+  }
+  return analyticsTableCheck;
+}
+
+async function validateAnalyticsTable(): Promise<boolean> {
   try {
     console.log('Validating chat_analytics table structure...');
     
@@ -435,11 +435,13 @@ export function analyzeUserSegments(analyticsData: AnalyticsData[]) {
     technical: 0, conceptual: 0, otherType: 0 // Query types
   };
 
-  const technicalKeywords = new Set([
+  // Deduplicated once up front; queries are matched against this list directly
+  // rather than re-spreading the set into a new array for every query
+  const technicalKeywords = Array.from(new Set([
     ...maThemes['Valuation & Pricing'], ...maThemes['Financing & Funding'],
     ...maThemes['Legal & Contracts'], ...maThemes['Deal Structuring'],
     ...maThemes['Taxes'], 'ebitda', 'sba', 'loi' // Ensure key acronyms are included
-  ]);
+  ]));
 
   const conceptualPhrases = ['how to', 'what is', 'why', 'explain', 'difference', 'compare', 'strategy', 'approach', 'methodology', 'consider', 'should i', 'benefit', 'risk'];
 
@@ -454,15 +456,14 @@ export function analyzeUserSegments(analyticsData: AnalyticsData[]) {
     // Query type segmentation (based on *dominant* type in conversation)
     let techScore = 0;
     let conceptualScore = 0;
-    const allQueriesText = queries.join(' ').toLowerCase();
 
     queries.forEach(query => {
       const lowerQuery = query.toLowerCase();
       if (conceptualPhrases.some(phrase => lowerQuery.includes(phrase))) {
         conceptualScore++;
       }
-      // Check against technical keywords set for efficiency
-      if ([...technicalKeywords].some(term => lowerQuery.includes(term))) {
+      // Stops at the first technical keyword found
+      if (technicalKeywords.some(term => lowerQuery.includes(term))) {
           techScore++;
       }
     });
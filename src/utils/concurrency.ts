@@ -0,0 +1,5 @@
+/**
+ * Bounded concurrency helper. It lives with the edge functions so the client
+ * and the functions share one implementation; re-exported for client code.
+ */
+export { runWithConcurrency } from '../../supabase/functions/_shared/concurrency.ts';
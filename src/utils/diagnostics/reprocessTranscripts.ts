@@ -10,7 +10,12 @@
 
 import { supabase } from '@/integrations/supabase/client';
 import { Json } from '@/integrations/supabase/types';
-import { v4 as uuidv4 } from 'uuid';
+import { createReprocessingChunks, iterateInsertBatches } from '../../../supabase/functions/_shared/chunking.ts';
+import { runWithConcurrency } from '@/utils/concurrency';
+
+// How many transcripts are reprocessed at the same time; kept small so bulk
+// reprocessing does not overwhelm the database or the edge function
+const MAX_CONCURRENT_REPROCESSING = 3;
 
 /**
  * Reprocesses a transcript with the new hierarchical chunking strategy
@@ -44,10 +49,10 @@ export async function reprocessTranscript(transcriptId: string): Promise<boolean
       // Fall back to client-side implementation if function fails
       console.log('[REPROCESS] Falling back to client-side implementation');
       
-      // First check if transcript exists
+      // First check if transcript exists, fetching only the columns used here
       const { data: transcript, error: fetchError } = await supabase
         .from('transcripts')
-        .select('*')
+        .select('content, metadata')
         .eq('id', transcriptId)
         .single();
       
@@ -67,11 +72,8 @@ export async function reprocessTranscript(transcriptId: string): Promise<boolean
         return false;
       }
       
-      // Create parent chunks
-      const parentChunks = createSimulatedParentChunks(transcript.content);
-      
       // Create and store hierarchical chunks
-      const success = await storeSimulatedHierarchicalChunks(parentChunks, transcriptId);
+      const success = await storeSimulatedHierarchicalChunks(transcript.content, transcriptId);
       
       if (success) {
         // Update transcript metadata to reflect reprocessing
@@ -79,6 +81,11 @@ export async function reprocessTranscript(transcriptId: string): Promise<boolean
         metadataObj.reprocessed_at = new Date().toISOString();
         metadataObj.chunking_strategy = 'hierarchical';
         metadataObj.implementation = 'client-side-fallback';
+        // These chunks were not written by either edge function, so their
+        // content hashes no longer describe the stored chunks and must not
+        // let the next run skip re-chunking
+        metadataObj.content_hash = null;
+        metadataObj.hierarchical_content_hash = null;
         
         const { error: updateError } = await supabase
           .from('transcripts')
@@ -103,92 +110,55 @@ export async function reprocessTranscript(transcriptId: string): Promise<boolean
 }
 
 /**
- * Creates simulated parent chunks for the transcript
+ * Reprocesses several transcripts, a few at a time
+ * @param transcriptIds The IDs of the transcripts to reprocess
+ * @param onResult Called as each transcript finishes, e.g. to update progress
  */
-function createSimulatedParentChunks(content: string): any[] {
-  if (!content) return [];
-  
-  // Split content into paragraphs
-  const paragraphs = content.split('\n\n');
-  
-  // Create at least 3 parent chunks for testing
-  const numChunks = Math.max(3, Math.ceil(paragraphs.length / 5));
-  const chunks = [];
-  
-  for (let i = 0; i < numChunks; i++) {
-    const startIdx = Math.floor((i * paragraphs.length) / numChunks);
-    const endIdx = Math.floor(((i + 1) * paragraphs.length) / numChunks);
-    const chunkParagraphs = paragraphs.slice(startIdx, endIdx);
-    
-    chunks.push({
-      content: chunkParagraphs.join('\n\n'),
-      topic: `Topic ${i + 1}`,
-      position: i,
-    });
-  }
-  
-  return chunks;
+export async function reprocessTranscripts(
+  transcriptIds: string[],
+  onResult?: (transcriptId: string, success: boolean) => void
+): Promise<{success: number, failed: number}> {
+  let success = 0;
+  let failed = 0;
+
+  // Each reprocess is network-bound, so overlapping a few of them hides most
+  // of the round-trip time without flooding the edge function
+  await runWithConcurrency(transcriptIds, MAX_CONCURRENT_REPROCESSING, async (transcriptId) => {
+    let result = false;
+    try {
+      result = await reprocessTranscript(transcriptId);
+    } catch (error) {
+      console.error(`[REPROCESS] Error reprocessing transcript ${transcriptId}:`, error);
+    }
+
+    if (result) {
+      success++;
+    } else {
+      failed++;
+    }
+    onResult?.(transcriptId, result);
+  });
+
+  return { success, failed };
 }
 
 /**
- * Stores simulated hierarchical chunks for the transcript
+ * Creates and stores simulated hierarchical chunks for the transcript
  */
-async function storeSimulatedHierarchicalChunks(parentChunks: any[], transcriptId: string): Promise<boolean> {
+async function storeSimulatedHierarchicalChunks(content: string, transcriptId: string): Promise<boolean> {
   try {
-    const allChunks = [];
+    // Built by the same chunker the edge function uses
+    const paragraphs = content ? content.split('\n\n') : [];
+    const { chunks: allChunks } = createReprocessingChunks(paragraphs, transcriptId, 'client-side');
     
-    // Create parent chunks
-    for (let i = 0; i < parentChunks.length; i++) {
-      // Use proper UUID format rather than concatenated strings
-      const parentId = uuidv4();
-      const parentChunk = parentChunks[i];
-      
-      // Add parent chunk
-      allChunks.push({
-        id: parentId,
-        content: parentChunk.content,
-        transcript_id: transcriptId,
-        chunk_type: 'parent',
-        topic: parentChunk.topic,
-        metadata: {
-          position: i,
-          parent_id: null,
-          chunk_strategy: 'hierarchical',
-          implementation: 'client-side'
-        }
-      });
-      
-      // Create 3-5 child chunks for each parent
-      const sentences = parentChunk.content.match(/[^.!?]+[.!?]+/g) || [];
-      const numChildren = Math.min(5, sentences.length);
-      
-      for (let j = 0; j < numChildren; j++) {
-        const sentence = sentences[j] ? sentences[j].trim() : `Child chunk ${j + 1} content`;
-        
-        allChunks.push({
-          id: uuidv4(), // Use proper UUID for child chunks too
-          content: sentence,
-          transcript_id: transcriptId,
-          chunk_type: 'child',
-          topic: null,
-          metadata: {
-            position: j,
-            parent_id: parentId,
-            chunk_strategy: 'hierarchical',
-            implementation: 'client-side'
-          }
-        });
-      }
-    }
-    
-    // Store all chunks in batches
-    const BATCH_SIZE = 20;
-    for (let i = 0; i < allChunks.length; i += BATCH_SIZE) {
-      const batch = allChunks.slice(i, i + BATCH_SIZE);
+    // Store all chunks in as few multi-row inserts as the payload limits allow
+    let batchNumber = 0;
+    for (const batch of iterateInsertBatches(allChunks)) {
+      batchNumber++;
       const { error } = await supabase.from('chunks').insert(batch);
       
       if (error) {
-        console.error(`[REPROCESS] Error storing chunk batch ${i / BATCH_SIZE + 1}:`, error);
+        console.error(`[REPROCESS] Error storing chunk batch ${batchNumber}:`, error);
         return false;
       }
     }
@@ -244,25 +214,16 @@ export async function reprocessAllTranscripts(): Promise<{success: number, faile
       return { success: 0, failed: 0 };
     }
     
-    let success = 0;
-    let failed = 0;
-    
-    // Process each transcript sequentially to avoid overwhelming the database
-    for (const transcript of data) {
-      const hasHierarchical = await hasHierarchicalChunks(transcript.id);
-      
-      // Only reprocess if it doesn't already have hierarchical chunks
-      if (!hasHierarchical) {
-        const result = await reprocessTranscript(transcript.id);
-        if (result) {
-          success++;
-        } else {
-          failed++;
-        }
+    // Only reprocess transcripts that don't already have hierarchical
+    // chunks; the checks are network-bound, so a few run at once
+    const pendingIds: string[] = [];
+    await runWithConcurrency(data, MAX_CONCURRENT_REPROCESSING, async (transcript) => {
+      if (!await hasHierarchicalChunks(transcript.id)) {
+        pendingIds.push(transcript.id);
       }
-    }
+    });
     
-    return { success, failed };
+    return await reprocessTranscripts(pendingIds);
   } catch (error) {
     console.error('[REPROCESS] Error in reprocessAllTranscripts:', error);
     return { success: 0, failed: 1 };
@@ -4,23 +4,17 @@
  */
 import { supabase } from '@/integrations/supabase/client';
 import { Json } from '@/integrations/supabase/types';
+import {
+  createParentChunks,
+  createHierarchicalChunks,
+  iterateParentChunks,
+  iterateInsertBatches,
+  type TranscriptChunk,
+} from '../../../supabase/functions/_shared/chunking.ts';
 
-// Define proper types for metadata and chunks
-interface ChunkMetadata {
-  position: number;
-  parent_id: string | null;
-  chunk_strategy: string;
-  [key: string]: any;
-}
-
-interface TranscriptChunk {
-  id: string;
-  content: string;
-  transcript_id: string;
-  chunk_type: 'parent' | 'child';
-  topic: string | null;
-  metadata: ChunkMetadata;
-}
+// The chunker itself lives with the edge functions so the client and
+// process-transcript share one implementation; re-exported for existing callers
+export { createParentChunks, createHierarchicalChunks, iterateParentChunks };
 
 /**
  * Process a single transcript with hierarchical chunking
@@ -73,95 +67,6 @@ export async function processTranscriptWithHierarchicalChunking(transcriptId: st
   }
 }
 
-/**
- * Create large, topically coherent parent chunks
- */
-export async function createParentChunks(content: string): Promise<any[]> {
-  // Create large, topically coherent parent chunks
-  // This is a simplified implementation - in production, you'd use more sophisticated NLP
-  const paragraphs = content.split('\n\n');
-  
-  // Group paragraphs into topically related sections
-  let currentTopic = '';
-  let currentChunk = '';
-  const parentChunks = [];
-  
-  for (const paragraph of paragraphs) {
-    // For this simplified implementation, we'll just use paragraph breaks
-    // In a real system, you'd use NLP to detect topic changes
-    if (currentChunk.length > 1500) {
-      parentChunks.push({
-        content: currentChunk,
-        topic: currentTopic || 'Unknown',
-      });
-      currentChunk = paragraph;
-      // Extract topic from first sentence for demo purposes
-      currentTopic = paragraph.split('.')[0];
-    } else {
-      currentChunk += '\n\n' + paragraph;
-    }
-  }
-  
-  // Add the last chunk
-  if (currentChunk) {
-    parentChunks.push({
-      content: currentChunk,
-      topic: currentTopic || 'Unknown',
-    });
-  }
-  
-  return parentChunks;
-}
-
-/**
- * Create child chunks for each parent
- */
-export async function createHierarchicalChunks(parentChunks: any[], transcript: any): Promise<TranscriptChunk[]> {
-  // Create child chunks for each parent
-  const hierarchicalChunks: TranscriptChunk[] = [];
-  
-  for (let i = 0; i < parentChunks.length; i++) {
-    const parentChunk = parentChunks[i];
-    const parentId = `${transcript.id}-parent-${i}`;
-    
-    // Add parent chunk
-    hierarchicalChunks.push({
-      id: parentId,
-      content: parentChunk.content,
-      transcript_id: transcript.id,
-      chunk_type: 'parent',
-      topic: parentChunk.topic,
-      metadata: {
-        position: i,
-        parent_id: null,
-        chunk_strategy: 'hierarchical',
-      }
-    });
-    
-    // Create child chunks
-    const sentences = parentChunk.content.match(/[^.!?]+[.!?]+/g) || [];
-    for (let j = 0; j < sentences.length; j++) {
-      const sentence = sentences[j].trim();
-      if (sentence.split(' ').length > 5) { // Only include substantive sentences
-        hierarchicalChunks.push({
-          id: `${transcript.id}-child-${i}-${j}`,
-          content: sentence,
-          transcript_id: transcript.id,
-          chunk_type: 'child',
-          topic: parentChunk.topic,
-          metadata: {
-            position: j,
-            parent_id: parentId,
-            chunk_strategy: 'hierarchical',
-          }
-        });
-      }
-    }
-  }
-  
-  return hierarchicalChunks;
-}
-
 /**
  * Store hierarchical chunks with parent-child relationships
  */
@@ -179,16 +84,17 @@ export async function storeHierarchicalChunks(chunks: TranscriptChunk[], transcr
     }
     
     // Then insert the new hierarchical chunks
-    // Performing in batches to avoid potential payload size limitations
-    const BATCH_SIZE = 50;
-    for (let i = 0; i < chunks.length; i += BATCH_SIZE) {
-      const batch = chunks.slice(i, i + BATCH_SIZE);
+    // Performing in as few size-bounded batches as possible to stay under
+    // payload limits without a round trip per 50 rows
+    let batchNumber = 0;
+    for (const batch of iterateInsertBatches(chunks)) {
+      batchNumber++;
       const { error } = await supabase
         .from('chunks')
         .insert(batch);
       
       if (error) {
-        console.error(`Error storing hierarchical chunks (batch ${i / BATCH_SIZE + 1}):`, error);
+        console.error(`Error storing hierarchical chunks (batch ${batchNumber}):`, error);
         return false;
       }
     }
@@ -57,6 +57,35 @@ export async function markTranscriptAsProcessed(transcriptId: string) {
 }
 import { supabase } from '@/integrations/supabase/client';
 
+/**
+ * Adds tags to several transcripts in one request, keeping each transcript's
+ * existing tags and skipping tags it already has
+ */
+export async function addTagsToTranscripts(transcriptIds: string[], tags: string[]): Promise<{
+  success: boolean;
+  updatedIds: string[];
+  error?: string;
+}> {
+  console.log(`[MANAGEMENT] Adding ${tags.length} tags to ${transcriptIds.length} transcripts`);
+  
+  try {
+    const { data, error } = await supabase.rpc('add_tags_to_transcripts', {
+      transcript_ids: transcriptIds,
+      new_tags: tags
+    });
+    
+    if (error) {
+      console.error(`[MANAGEMENT] Error adding tags:`, error);
+      throw error;
+    }
+    
+    return { success: true, updatedIds: data || [] };
+  } catch (error: any) {
+    console.error('[MANAGEMENT] Error adding tags to transcripts:', error);
+    return { success: false, updatedIds: [], error: error.message };
+  }
+}
+
 /**
  * Enhanced bucket check with better error handling and authentication checks
  * FIXED: Prevents unnecessary bucket creation attempts
@@ -411,8 +411,10 @@ export async function batchProcessUnprocessedTranscripts(options = {
       
       console.log(`[BATCH] Processing batch ${Math.floor(i / batchSize) + 1} of ${Math.ceil(transcripts.length / batchSize)}`);
       
-      // Process each transcript in the batch
-      for (const transcript of batch) {
+      // Process the transcripts in the batch concurrently; each invocation is
+      // chunked in its own edge function instance, so the batch size bounds
+      // how many run at once
+      await Promise.all(batch.map(async (transcript) => {
         try {
           const { error: processError } = await supabase.functions.invoke('trigger-transcript-processing', {
             body: { id: transcript.id }
@@ -428,10 +430,7 @@ export async function batchProcessUnprocessedTranscripts(options = {
           console.error(`[BATCH] Unexpected error for transcript ${transcript.id}:`, error);
           errors[transcript.id] = `Unexpected error: ${error.message || 'Unknown error'}`;
         }
-        
-        // Small delay between requests to avoid overwhelming the system
-        await new Promise(resolve => setTimeout(resolve, 500));
-      }
+      }));
       
       // Delay between batches
       if (i + batchSize < transcripts.length) {
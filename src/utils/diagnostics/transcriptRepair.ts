@@ -15,10 +15,10 @@ export async function fixTranscriptIssues(transcriptIds: string[]) {
   
   for (const id of transcriptIds) {
     try {
-      // Get the transcript
+      // Get the transcript, fetching only the columns checked below
       const { data: transcript, error: getError } = await supabase
         .from('transcripts')
-        .select('*')
+        .select('file_path, content')
         .eq('id', id)
         .single();
         
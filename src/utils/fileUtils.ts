@@ -29,9 +29,11 @@ export function sanitizeFilename(filename: string): string {
  */
 export function generateStoragePath(userId: string, fileName: string): string {
   const timestamp = Date.now();
-  const fileNameParts = fileName.split('.');
-  const extension = fileNameParts.pop()?.toLowerCase() || '';
-  const baseName = fileNameParts.join('.'); 
+  // Split at the last dot in place rather than splitting on every dot and
+  // re-joining; a name without a dot is treated as all extension, as before
+  const dotIndex = fileName.lastIndexOf('.');
+  const extension = getFileExtension(fileName);
+  const baseName = dotIndex === -1 ? '' : fileName.slice(0, dotIndex);
   const sanitized = sanitizeFilename(baseName);
   
   return `${userId}/${timestamp}_${sanitized}.${extension}`;
@@ -55,7 +57,7 @@ export function generatePublicUrl(bucket: string, filePath: string): string {
  * @returns The file extension without the dot
  */
 export function getFileExtension(filename: string): string {
-  return filename.split('.').pop()?.toLowerCase() || '';
+  return filename.slice(filename.lastIndexOf('.') + 1).toLowerCase();
 }
 
 /**
@@ -83,13 +83,18 @@ export const dbMessageToUiMessage = (dbMessage: DbMessage): MessageData => {
   };
 };
 
+// Every MessageSource value, as a set for constant-time lookups
+const VALID_MESSAGE_SOURCES: ReadonlySet<string> = new Set<MessageSource>([
+  'user', 'system', 'gemini', 'vertex', 'transcript', 'cache', 'web', 'fallback'
+]);
+
 /**
  * Type guard to check if a string is a valid MessageSource
  * @param source The source string to validate
  * @returns boolean indicating if the source is valid
  */
 export const isValidMessageSource = (source: string): source is MessageSource => {
-  return ['user', 'system', 'gemini', 'vertex', 'transcript', 'cache', 'web', 'fallback'].includes(source);
+  return VALID_MESSAGE_SOURCES.has(source);
 };
 
 /**
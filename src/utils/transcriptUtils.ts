@@ -18,6 +18,22 @@ export type Transcript = {
   metadata?: Record<string, any>; // Add metadata property
 };
 
+const PARAGRAPH_BREAK_PATTERN = /\n\s*\n/;
+// Breaks that are anything other than a plain "\n\n" (blank lines holding
+// spaces or tabs, or three or more newlines)
+const IRREGULAR_PARAGRAPH_BREAK_PATTERN = /\n(?:[^\S\n]+|\n[^\S\n]*)\n/;
+
+/**
+ * Split content into paragraphs on blank lines. Equivalent to
+ * content.split(/\n\s*\n/), but most transcripts only use plain "\n\n"
+ * breaks, so the regex split is only used when an irregular break is present.
+ */
+function splitParagraphs(content: string): string[] {
+  return IRREGULAR_PARAGRAPH_BREAK_PATTERN.test(content)
+    ? content.split(PARAGRAPH_BREAK_PATTERN)
+    : content.split('\n\n');
+}
+
 export function getTranscriptCounts(transcripts: Transcript[]) {
   let protege_call = 0;
   let foundations_call = 0;
@@ -306,6 +322,14 @@ export function formatTagForStorage(tag: string): string {
     .replace(/[^a-z0-9-]/g, '');
 }
 
+// Query terms that count double when scoring transcripts
+const BUSINESS_KEYWORDS = new Set([
+  'acquisition', 'deal', 'finance', 'negotiate', 'valuation', 
+  'due diligence', 'cashflow', 'funding', 'seller', 'owner', 'sba', 
+  'structure', 'roi', 'risk', 'revenue', 'profit', 'ebitda', 'multiple',
+  'broker', 'capital', 'closing', 'contract', 'leverage', 'debt', 'equity'
+]);
+
 export function searchTranscriptsForQuery(query: string, transcripts: Transcript[]) {
   if (!query || !transcripts || transcripts.length === 0) {
     return null;
@@ -313,18 +337,21 @@ export function searchTranscriptsForQuery(query: string, transcripts: Transcript
 
   const normalizedQuery = query.toLowerCase().trim();
   
-  const businessKeywords = [
-    'acquisition', 'deal', 'finance', 'negotiate', 'valuation', 
-    'due diligence', 'cashflow', 'funding', 'seller', 'owner', 'sba', 
-    'structure', 'roi', 'risk', 'revenue', 'profit', 'ebitda', 'multiple',
-    'broker', 'capital', 'closing', 'contract', 'leverage', 'debt', 'equity'
-  ];
+  const queryTerms = normalizedQuery.split(/\s+/);
+  
+  // Each term's pattern and weight depend only on the query, so they are
+  // worked out once here rather than again for every transcript
+  const termPatterns = queryTerms
+    .filter(term => term.length > 2)
+    .map(term => ({
+      regex: new RegExp(`\\b${term}\\b`, 'g'),
+      weight: (BUSINESS_KEYWORDS.has(term) ? 2 : 1) * (term.length > 5 ? 1.5 : 1)
+    }));
   
   const matchedTranscripts = transcripts
     .filter(transcript => transcript.content && transcript.content.length > 0)
     .map(transcript => {
       const content = transcript.content.toLowerCase();
-      const queryTerms = normalizedQuery.split(/\s+/);
       
       let relevanceScore = 0;
       let exactPhraseMatch = false;
@@ -334,26 +361,15 @@ export function searchTranscriptsForQuery(query: string, transcripts: Transcript
         exactPhraseMatch = true;
       }
       
-      queryTerms.forEach(term => {
-        if (term.length > 2) {
-          const regex = new RegExp(`\\b${term}\\b`, 'g');
-          const matches = content.match(regex);
-          
-          if (matches) {
-            let termScore = matches.length;
-            
-            if (businessKeywords.includes(term)) {
-              termScore *= 2;
-            }
-            
-            if (term.length > 5) {
-              termScore *= 1.5;
-            }
-            
-            relevanceScore += termScore;
-          }
+      // match() with a global pattern always starts from the beginning, so
+      // the shared patterns can be reused for every transcript
+      for (const { regex, weight } of termPatterns) {
+        const matches = content.match(regex);
+        
+        if (matches) {
+          relevanceScore += matches.length * weight;
         }
-      });
+      }
       
       // Boost relevance for business_acquisitions_summit as it's the newest content
       const sourceBoost = transcript.source === 'business_acquisitions_summit_2025' ? 2.5 : 
@@ -364,7 +380,7 @@ export function searchTranscriptsForQuery(query: string, transcripts: Transcript
       relevanceScore *= sourceBoost;
       
       if (queryTerms.length > 1 && !exactPhraseMatch) {
-        const contentParagraphs = content.split(/\n\s*\n/);
+        const contentParagraphs = splitParagraphs(content);
         
         for (const paragraph of contentParagraphs) {
           let termsInParagraph = 0;
@@ -434,7 +450,11 @@ export function extractRelevantContent(transcript: Transcript, query: string, ma
   const normalizedQuery = query.toLowerCase().trim();
   const queryTerms = normalizedQuery.split(/\s+/).filter(term => term.length > 2);
   
-  const paragraphs = content.split(/\n\s*\n/);
+  // Compile each term's pattern once for all paragraphs rather than once per
+  // paragraph; match() with a global pattern always starts from the beginning
+  const termPatterns = queryTerms.map(term => new RegExp(`\\b${term}\\b`, 'gi'));
+  
+  const paragraphs = splitParagraphs(content);
   
   const scoredParagraphs = paragraphs.map(paragraph => {
     let score = 0;
@@ -443,8 +463,7 @@ export function extractRelevantContent(transcript: Transcript, query: string, ma
       score += 50;
     }
     
-    for (const term of queryTerms) {
-      const regex = new RegExp(`\\b${term}\\b`, 'gi');
+    for (const regex of termPatterns) {
       const matches = paragraph.match(regex);
       if (matches) {
         score += matches.length * 10;
@@ -0,0 +1,48 @@
+/**
+ * Reuse of OAuth access tokens across the requests an isolate serves, shared
+ * by the edge functions that call Google model APIs with a service account.
+ * Each token is kept until shortly before it expires, so requests skip the
+ * JWT signing and token endpoint round trip.
+ */
+
+// Token endpoint response fields the cache needs
+export interface AccessTokenResponse {
+  access_token: string;
+  expires_in?: number;
+}
+
+const TOKEN_REFRESH_MARGIN_MS = 5 * 60 * 1000;
+const DEFAULT_TOKEN_LIFETIME_SECONDS = 3600;
+
+/**
+ * Wrap a token fetcher so its token is reused until it is about to expire.
+ * Concurrent callers share one token exchange instead of racing, and a
+ * failed exchange is not cached, so the next call tries again.
+ */
+export function createAccessTokenCache<Args extends unknown[]>(
+  fetchToken: (...args: Args) => Promise<AccessTokenResponse>
+): (...args: Args) => Promise<string> {
+  let cached: { token: string; expiresAt: number } | null = null;
+  let pending: Promise<string> | null = null;
+
+  return (...args: Args) => {
+    if (cached && Date.now() < cached.expiresAt - TOKEN_REFRESH_MARGIN_MS) {
+      return Promise.resolve(cached.token);
+    }
+
+    if (!pending) {
+      pending = fetchToken(...args)
+        .then(tokenData => {
+          cached = {
+            token: tokenData.access_token,
+            expiresAt: Date.now() + (tokenData.expires_in ?? DEFAULT_TOKEN_LIFETIME_SECONDS) * 1000,
+          };
+          return tokenData.access_token;
+        })
+        .finally(() => {
+          pending = null;
+        });
+    }
+    return pending;
+  };
+}
@@ -0,0 +1,290 @@
+/**
+ * Hierarchical transcript chunker shared by the process-transcript edge
+ * function and the client-side diagnostics, so both produce the same chunks
+ * from a single implementation, plus the simpler evenly-split chunker used
+ * when reprocessing transcripts and the batching used to store chunks.
+ * Runtime-agnostic: only web APIs available in both Deno and browsers.
+ */
+
+// Define proper types for metadata and chunks
+export interface ChunkMetadata {
+  position: number;
+  parent_id: string | null;
+  chunk_strategy: string;
+  [key: string]: any;
+}
+
+export interface TranscriptChunk {
+  id: string;
+  content: string;
+  transcript_id: string;
+  chunk_type: 'parent' | 'child';
+  topic: string | null;
+  metadata: ChunkMetadata;
+}
+
+/**
+ * Create large, topically coherent parent chunks
+ */
+export async function createParentChunks(content: string): Promise<any[]> {
+  return Array.from(iterateParentChunks(content));
+}
+
+/**
+ * Yield parent chunks one at a time as each one fills up, so streaming
+ * callers never hold the paragraph list or the full chunk list
+ */
+export function* iterateParentChunks(content: string): Generator<{ content: string; topic: string }> {
+  // Create large, topically coherent parent chunks
+  // This is a simplified implementation - in production, you'd use more sophisticated NLP
+  
+  // Group paragraphs into topically related sections
+  // Paragraphs are buffered and joined once per chunk rather than appended to
+  // a growing string; the leading '' keeps the first chunk's '\n\n' prefix
+  let currentTopic = '';
+  let currentParagraphs: string[] = [''];
+  let currentLength = 0;
+  
+  for (const paragraph of iterateParagraphs(content)) {
+    // For this simplified implementation, we'll just use paragraph breaks
+    // In a real system, you'd use NLP to detect topic changes
+    if (currentLength > 1500) {
+      yield {
+        content: currentParagraphs.join('\n\n'),
+        topic: currentTopic || 'Unknown',
+      };
+      currentParagraphs = [paragraph];
+      currentLength = paragraph.length;
+      // Extract topic from first sentence for demo purposes; the split limit
+      // stops at the first '.' instead of splitting the whole paragraph
+      currentTopic = paragraph.split('.', 1)[0];
+    } else {
+      currentParagraphs.push(paragraph);
+      currentLength += 2 + paragraph.length;
+    }
+  }
+  
+  // Add the last chunk
+  const lastChunk = currentParagraphs.join('\n\n');
+  if (lastChunk) {
+    yield {
+      content: lastChunk,
+      topic: currentTopic || 'Unknown',
+    };
+  }
+}
+
+/**
+ * Lazily yield the same paragraphs as content.split('\n\n')
+ */
+function* iterateParagraphs(content: string): Generator<string> {
+  let start = 0;
+  while (true) {
+    const breakIndex = content.indexOf('\n\n', start);
+    if (breakIndex === -1) {
+      yield content.slice(start);
+      return;
+    }
+    yield content.slice(start, breakIndex);
+    start = breakIndex + 2;
+  }
+}
+
+/**
+ * Split text into sentences in a single left-to-right scan.
+ * Equivalent to matching /[^.!?]+[.!?]+/g and trimming each match, without
+ * running the regex engine over the text: a sentence is a run of
+ * non-terminator characters followed by one or more of '.', '!' or '?'.
+ * Trailing text without a terminator is dropped, as with the regex.
+ */
+function splitIntoSentences(text: string): string[] {
+  const sentences: string[] = [];
+  const length = text.length;
+  let start = 0;
+  let i = 0;
+
+  while (i < length) {
+    if (!isSentenceTerminator(text.charCodeAt(i))) {
+      i++;
+      continue;
+    }
+
+    // Consume the whole run of terminators ("?!", "...")
+    let end = i + 1;
+    while (end < length && isSentenceTerminator(text.charCodeAt(end))) {
+      end++;
+    }
+
+    // A run of terminators with no preceding text is not a sentence
+    if (i > start) {
+      sentences.push(text.slice(start, end).trim());
+    }
+
+    start = end;
+    i = end;
+  }
+
+  return sentences;
+}
+
+function isSentenceTerminator(code: number): boolean {
+  return code === 46 /* . */ || code === 33 /* ! */ || code === 63 /* ? */;
+}
+
+/**
+ * Same result as text.split(' ').length > limit, but counts spaces in place
+ * and stops as soon as the limit is passed instead of allocating every word.
+ */
+function hasMoreWordsThan(text: string, limit: number): boolean {
+  let words = 1;
+  for (let i = 0; i < text.length; i++) {
+    if (text.charCodeAt(i) === 32 /* space */ && ++words > limit) {
+      return true;
+    }
+  }
+  return words > limit;
+}
+
+/**
+ * Create child chunks for each parent
+ */
+export async function createHierarchicalChunks(parentChunks: any[], transcript: any): Promise<TranscriptChunk[]> {
+  return Array.from(iterateHierarchicalChunks(parentChunks, transcript));
+}
+
+/**
+ * Yield each parent chunk followed by its child chunks, so callers can store
+ * chunks in batches as they are produced instead of building the full list
+ */
+export function* iterateHierarchicalChunks(
+  parentChunks: Iterable<{ content: string; topic: string }>,
+  transcript: any
+): Generator<TranscriptChunk> {
+  let i = 0;
+  for (const parentChunk of parentChunks) {
+    const parentId = `${transcript.id}-parent-${i}`;
+    
+    // Add parent chunk
+    yield {
+      id: parentId,
+      content: parentChunk.content,
+      transcript_id: transcript.id,
+      chunk_type: 'parent',
+      topic: parentChunk.topic,
+      metadata: {
+        position: i,
+        parent_id: null,
+        chunk_strategy: 'hierarchical',
+      }
+    };
+    
+    // Create child chunks
+    const sentences = splitIntoSentences(parentChunk.content);
+    for (let j = 0; j < sentences.length; j++) {
+      const sentence = sentences[j];
+      if (hasMoreWordsThan(sentence, 5)) { // Only include substantive sentences
+        yield {
+          id: `${transcript.id}-child-${i}-${j}`,
+          content: sentence,
+          transcript_id: transcript.id,
+          chunk_type: 'child',
+          topic: parentChunk.topic,
+          metadata: {
+            position: j,
+            parent_id: parentId,
+            chunk_strategy: 'hierarchical',
+          }
+        };
+      }
+    }
+    
+    i++;
+  }
+}
+
+// Sentence pattern used for reprocessing child chunks, compiled once
+const REPROCESS_SENTENCE_PATTERN = /[^.!?]+[.!?]+/g;
+
+/**
+ * Split paragraphs evenly into parent chunks (about five paragraphs each, at
+ * least three parents) with up to five sentence child chunks per parent.
+ * Used by process-with-hierarchical-chunking and its client-side fallback;
+ * `implementation` records which of them stored the chunks.
+ */
+export function createReprocessingChunks(
+  paragraphs: string[],
+  transcriptId: string,
+  implementation: string
+): { chunks: TranscriptChunk[]; parentCount: number } {
+  if (paragraphs.length === 0) {
+    return { chunks: [], parentCount: 0 };
+  }
+
+  // Metadata shared by every chunk, built once and spread into each row
+  const baseMetadata = { chunk_strategy: 'hierarchical', implementation };
+  const parentCount = Math.max(3, Math.ceil(paragraphs.length / 5));
+  const chunks: TranscriptChunk[] = [];
+
+  for (let i = 0; i < parentCount; i++) {
+    const startIdx = Math.floor((i * paragraphs.length) / parentCount);
+    const endIdx = Math.floor(((i + 1) * paragraphs.length) / parentCount);
+    const parentContent = paragraphs.slice(startIdx, endIdx).join('\n\n');
+    // Use proper UUIDs instead of concatenating strings
+    const parentId = crypto.randomUUID();
+
+    chunks.push({
+      id: parentId,
+      content: parentContent,
+      transcript_id: transcriptId,
+      chunk_type: 'parent',
+      topic: `Topic ${i + 1}`,
+      metadata: { position: i, parent_id: null, ...baseMetadata }
+    });
+
+    const sentences = parentContent.match(REPROCESS_SENTENCE_PATTERN) || [];
+    const childCount = Math.min(5, sentences.length);
+    for (let j = 0; j < childCount; j++) {
+      chunks.push({
+        id: crypto.randomUUID(),
+        content: sentences[j].trim(),
+        transcript_id: transcriptId,
+        chunk_type: 'child',
+        topic: null,
+        metadata: { position: j, parent_id: parentId, ...baseMetadata }
+      });
+    }
+  }
+
+  return { chunks, parentCount };
+}
+
+// Default limits for one multi-row chunk insert request
+export const MAX_INSERT_BATCH_ROWS = 250;
+export const MAX_INSERT_BATCH_CHARS = 1_000_000;
+
+/**
+ * Split chunk rows into as few multi-row insert batches as possible, cutting
+ * a batch when it reaches maxRows rows or maxChars characters of content so
+ * each request stays under payload limits
+ */
+export function* iterateInsertBatches<T extends { content: string }>(
+  chunks: T[],
+  maxRows: number = MAX_INSERT_BATCH_ROWS,
+  maxChars: number = MAX_INSERT_BATCH_CHARS
+): Generator<T[]> {
+  let batchStart = 0;
+  while (batchStart < chunks.length) {
+    let batchEnd = batchStart;
+    let batchChars = 0;
+    while (
+      batchEnd < chunks.length &&
+      batchEnd - batchStart < maxRows &&
+      (batchEnd === batchStart || batchChars + chunks[batchEnd].content.length <= maxChars)
+    ) {
+      batchChars += chunks[batchEnd].content.length;
+      batchEnd++;
+    }
+    yield chunks.slice(batchStart, batchEnd);
+    batchStart = batchEnd;
+  }
+}
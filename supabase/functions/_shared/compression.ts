@@ -0,0 +1,47 @@
+/**
+ * gzip for JSON responses from edge functions that return large result
+ * lists. Small bodies are sent as-is, since below about 1KB the gzip framing
+ * and CPU cost outweigh the bytes saved.
+ */
+
+const MIN_COMPRESSIBLE_BYTES = 1024;
+
+/**
+ * Whether the request's Accept-Encoding header allows a gzip response
+ */
+function acceptsGzip(req: Request): boolean {
+  const acceptEncoding = req.headers.get('Accept-Encoding');
+  if (!acceptEncoding) return false;
+  return acceptEncoding.split(',').some(part => {
+    const [coding, ...params] = part.trim().toLowerCase().split(';');
+    return (coding === 'gzip' || coding === '*') &&
+      !params.some(param => param.trim().replace(/\s/g, '') === 'q=0');
+  });
+}
+
+/**
+ * Build a JSON response, gzipped when the client accepts it and the body is
+ * large enough for compression to pay off
+ */
+export function jsonResponse(
+  req: Request,
+  body: unknown,
+  init: ResponseInit & { headers?: Record<string, string> } = {}
+): Response {
+  const bytes = new TextEncoder().encode(JSON.stringify(body));
+  const headers: Record<string, string> = {
+    ...init.headers,
+    'Content-Type': 'application/json',
+    'Vary': 'Accept-Encoding',
+  };
+
+  if (bytes.length < MIN_COMPRESSIBLE_BYTES || !acceptsGzip(req)) {
+    return new Response(bytes, { ...init, headers });
+  }
+
+  const compressed = new Blob([bytes]).stream().pipeThrough(new CompressionStream('gzip'));
+  return new Response(compressed, {
+    ...init,
+    headers: { ...headers, 'Content-Encoding': 'gzip' },
+  });
+}
@@ -0,0 +1,36 @@
+/**
+ * Bounded concurrency for network-bound work over a list (or lazy stream)
+ * of items, shared by the edge functions and the client
+ */
+
+/**
+ * Call fn for every item with at most `limit` calls in flight, starting the
+ * next item as soon as a call finishes. Items are pulled lazily, so a
+ * generator is only advanced as fast as the work completes. Once an item
+ * fails (fn or the iterator throws), no further items are started and the
+ * returned promise rejects with that error; callers that want to carry on
+ * past failures catch them inside fn.
+ */
+export async function runWithConcurrency<T>(
+  items: Iterable<T>,
+  limit: number,
+  fn: (item: T) => Promise<void>
+): Promise<void> {
+  const iterator = items[Symbol.iterator]();
+  let failed = false;
+
+  const worker = async () => {
+    try {
+      while (!failed) {
+        const next = iterator.next();
+        if (next.done) return;
+        await fn(next.value);
+      }
+    } catch (error) {
+      failed = true;
+      throw error;
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.max(1, limit) }, worker));
+}
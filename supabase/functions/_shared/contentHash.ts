@@ -0,0 +1,27 @@
+/**
+ * Change detection for transcript content, shared by the edge functions
+ * that skip re-chunking or re-summarizing content they have already handled
+ */
+
+/**
+ * Hash content for change detection (SHA-256, hex)
+ */
+export async function hashContent(content: string): Promise<string> {
+  const hashBuffer = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(content));
+  return Array.from(new Uint8Array(hashBuffer), b => b.toString(16).padStart(2, '0')).join('');
+}
+
+/**
+ * Whether any chunks are stored for a transcript. Read as a head-only count,
+ * so no chunk rows are transferred.
+ */
+export async function hasStoredChunks(
+  supabase: { from: (table: string) => any },
+  transcriptId: string
+): Promise<boolean> {
+  const { count, error } = await supabase
+    .from('chunks')
+    .select('id', { count: 'exact', head: true })
+    .eq('transcript_id', transcriptId);
+  return !error && (count ?? 0) > 0;
+}
@@ -0,0 +1,93 @@
+/**
+ * fetch with retries for transient failures, shared by the edge functions
+ * that call Google model APIs. Waits grow exponentially with random jitter,
+ * are capped, and follow the server's Retry-After when it sends one.
+ */
+
+export interface RetryOptions {
+  maxRetries?: number;
+  baseDelayMs?: number;
+  maxDelayMs?: number;
+  // Extra random fraction added to each delay (0.5 = up to +50%)
+  jitter?: number;
+  // Prefix for retry log lines, e.g. '[SUMMARY]'
+  logPrefix?: string;
+  // Time limit for each attempt, so a stalled call fails and can be retried
+  timeoutMs?: number;
+}
+
+const DEFAULT_MAX_RETRIES = 3;
+const DEFAULT_BASE_DELAY_MS = 1000;
+const DEFAULT_MAX_DELAY_MS = 30000;
+const DEFAULT_JITTER = 0.5;
+const DEFAULT_TIMEOUT_MS = 60000;
+
+/**
+ * Whether a response status is worth retrying: timeouts, rate limits and
+ * server errors. Other 4xx responses fail the same way on every attempt.
+ */
+export function isRetryableStatus(status: number): boolean {
+  return status === 408 || status === 429 || status >= 500;
+}
+
+/**
+ * Parse a Retry-After header (delay in seconds or an HTTP date) into
+ * milliseconds, or null if it is missing or unreadable
+ */
+function parseRetryAfterMs(header: string | null): number | null {
+  if (!header) return null;
+  const seconds = Number(header);
+  if (Number.isFinite(seconds)) return Math.max(0, seconds * 1000);
+  const date = Date.parse(header);
+  return Number.isNaN(date) ? null : Math.max(0, date - Date.now());
+}
+
+/**
+ * Like fetch, but each attempt is time-limited (reading the body included)
+ * and network errors, timeouts and retryable statuses are retried. The last
+ * response (or error) is returned (or thrown) once retries run out, so
+ * callers handle failures exactly as they would with fetch.
+ */
+export async function fetchWithRetry(
+  url: string,
+  init: RequestInit,
+  options: RetryOptions = {}
+): Promise<Response> {
+  const maxRetries = options.maxRetries ?? DEFAULT_MAX_RETRIES;
+  const baseDelayMs = options.baseDelayMs ?? DEFAULT_BASE_DELAY_MS;
+  const maxDelayMs = options.maxDelayMs ?? DEFAULT_MAX_DELAY_MS;
+  const jitter = options.jitter ?? DEFAULT_JITTER;
+  const logPrefix = options.logPrefix ?? '[RETRY]';
+  const timeoutMs = options.timeoutMs ?? DEFAULT_TIMEOUT_MS;
+
+  for (let attempt = 0; ; attempt++) {
+    let retryAfterMs: number | null = null;
+    let reason: string;
+
+    try {
+      // A fresh timeout per attempt; a timed-out attempt is retried, while an
+      // abort from the caller's own signal is not
+      const timeout = AbortSignal.timeout(timeoutMs);
+      const signal = init.signal ? AbortSignal.any([init.signal, timeout]) : timeout;
+      const response = await fetch(url, { ...init, signal });
+      if (response.ok || attempt >= maxRetries || !isRetryableStatus(response.status)) {
+        return response;
+      }
+      retryAfterMs = parseRetryAfterMs(response.headers.get('Retry-After'));
+      reason = `status ${response.status}`;
+      // Release the unread body so the connection can be reused
+      await response.body?.cancel();
+    } catch (error) {
+      // Aborts are deliberate; only network failures are retried
+      if (attempt >= maxRetries || (error instanceof DOMException && error.name === 'AbortError')) {
+        throw error;
+      }
+      reason = error instanceof Error ? error.message : String(error);
+    }
+
+    const backoffMs = Math.min(maxDelayMs, baseDelayMs * 2 ** attempt) * (1 + Math.random() * jitter);
+    const delayMs = retryAfterMs !== null ? Math.min(maxDelayMs, retryAfterMs) : backoffMs;
+    console.warn(`${logPrefix} Retrying after ${reason} in ${Math.round(delayMs)}ms (attempt ${attempt + 2}/${maxRetries + 1})`);
+    await new Promise(resolve => setTimeout(resolve, delayMs));
+  }
+}
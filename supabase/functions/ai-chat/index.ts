@@ -1,5 +1,5 @@
-import { serve } from 'https://deno.land/std@0.168.0/http/server.ts'
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2'
+import { fetchWithRetry } from '../_shared/retry.ts'
 
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
@@ -14,6 +14,75 @@ const supabase = createClient(supabaseUrl, supabaseServiceKey)
 // Gemini API configuration
 const GEMINI_API_KEY = Deno.env.get('GEMINI_API_KEY')
 const GEMINI_MODEL = 'gemini-2.0-flash'
+// Per-attempt limit for a chat completion, so a stalled call is retried
+const GEMINI_TIMEOUT_MS = 30000
+
+// Recent chunk search results by normalized query text, so repeated questions
+// skip the full-text search. Bounded and short-lived so new transcripts show
+// up soon.
+const CHUNK_SEARCH_CACHE_MAX_ENTRIES = 100
+const CHUNK_SEARCH_CACHE_TTL_MS = 5 * 60 * 1000
+const chunkSearchCache = new Map<string, { chunks: any[]; expiresAt: number }>()
+
+// Full-text search ignores case and extra whitespace, so questions that
+// differ only in those share one cache entry. Questions are parsed with
+// websearch_to_tsquery, which accepts free text (punctuation, quoted
+// phrases, "or", -excluded words) where to_tsquery rejects it.
+const WHITESPACE_RUN = /\s+/g
+
+function normalizeSearchQuery(query: string): string {
+  return query.trim().toLowerCase().replace(WHITESPACE_RUN, ' ')
+}
+
+function getCachedChunkSearch(query: string): any[] | null {
+  const entry = chunkSearchCache.get(query)
+  if (!entry) return null
+  // Drop the entry either way; a live one is re-inserted as most recently used
+  chunkSearchCache.delete(query)
+  if (entry.expiresAt <= Date.now()) return null
+  chunkSearchCache.set(query, entry)
+  return entry.chunks
+}
+
+function setCachedChunkSearch(query: string, chunks: any[]) {
+  if (chunkSearchCache.size >= CHUNK_SEARCH_CACHE_MAX_ENTRIES) {
+    chunkSearchCache.delete(chunkSearchCache.keys().next().value as string)
+  }
+  chunkSearchCache.set(query, { chunks, expiresAt: Date.now() + CHUNK_SEARCH_CACHE_TTL_MS })
+}
+
+// Chunk searches currently in flight by normalized query, so concurrent
+// requests for the same question share one database query instead of each
+// sending their own before the first result reaches the cache
+const pendingChunkSearches = new Map<string, Promise<{ data: any[] | null; error: any }>>()
+
+function searchChunks(searchQuery: string): Promise<{ data: any[] | null; error: any }> {
+  let pending = pendingChunkSearches.get(searchQuery)
+  if (!pending) {
+    // Only the columns used below are selected, so unused metadata is not
+    // serialized and parsed. Each chunk's transcript is embedded through the
+    // transcript_id foreign key, so citations come back in the same round
+    // trip instead of a second query.
+    pending = Promise.resolve(
+      supabase
+        .from('chunks')
+        .select('content, chunk_type, transcript_id, transcripts(id, title, source)')
+        .textSearch('content_tsv', searchQuery, { type: 'websearch', config: 'english' })
+        .limit(10) // Get more chunks for better context
+    )
+      .then(({ data, error }) => {
+        if (!error && data) {
+          setCachedChunkSearch(searchQuery, data)
+        }
+        return { data, error }
+      })
+      .finally(() => {
+        pendingChunkSearches.delete(searchQuery)
+      })
+    pendingChunkSearches.set(searchQuery, pending)
+  }
+  return pending
+}
 
 // M&A specific prompts
 const SYSTEM_RULES = `You are an AI assistant specializing in M&A (Mergers and Acquisitions) based on Carl Allen's teachings. 
@@ -55,7 +124,7 @@ function generateFollowUpQuestions(query: string, context: string): string[] {
   return questions.slice(0, 2) // Max 2 questions
 }
 
-serve(async (req) => {
+Deno.serve(async (req) => {
   if (req.method === 'OPTIONS') {
     return new Response('ok', { headers: corsHeaders })
   }
@@ -84,17 +153,16 @@ serve(async (req) => {
     
     console.log(`[${requestId}] Processing query: "${query?.substring(0, 50)}..."`)
 
-    // Get conversation context
-    let conversationContext = null
-    if (conversationId) {
-      const { data: contextData } = await supabase
-        .from('conversation_context')
-        .select('*')
-        .eq('conversation_id', conversationId)
-        .single()
-      
-      conversationContext = contextData
-    }
+    // Get conversation context; it does not depend on the searches below,
+    // so start it now and only wait for it when building the prompt
+    const conversationContextPromise = conversationId
+      ? supabase
+          .from('conversation_context')
+          .select('context_summary, key_topics')
+          .eq('conversation_id', conversationId)
+          .single()
+          .then(({ data: contextData }) => contextData)
+      : Promise.resolve(null)
 
     // Search for relevant chunks
     if (query) {
@@ -102,18 +170,23 @@ serve(async (req) => {
         console.log(`[${requestId}] Searching RAG chunks...`)
         
         // Enhanced chunk search with better relevance
-        const { data: chunks, error: searchError } = await supabase
-          .from('chunks')
-          .select('id, content, chunk_type, transcript_id, topic, metadata')
-          .textSearch('content', query)
-          .limit(10) // Get more chunks for better context
+        const searchQuery = normalizeSearchQuery(query)
+        let chunks = getCachedChunkSearch(searchQuery)
+        let searchError = null
+        if (chunks) {
+          console.log(`[${requestId}] Using cached chunk search results`)
+        } else {
+          const result = await searchChunks(searchQuery)
+          chunks = result.data
+          searchError = result.error
+        }
         
         if (!searchError && chunks && chunks.length > 0) {
           // Score and sort chunks by relevance
+          const queryLower = query.toLowerCase()
+          const queryWords = queryLower.split(' ')
           const scoredChunks = chunks.map(chunk => {
             const content = chunk.content.toLowerCase()
-            const queryLower = query.toLowerCase()
-            const queryWords = queryLower.split(' ')
             
             // Calculate relevance score
             let score = 0
@@ -143,18 +216,15 @@ serve(async (req) => {
             .map(chunk => `[${chunk.chunk_type}] ${chunk.content}`)
             .join('\n\n---\n\n')
           
-          // Track sources with metadata
-          const transcriptIds = [...new Set(topChunks.map(c => c.transcript_id))]
-          chunkSources = await Promise.all(
-            transcriptIds.map(async (tid) => {
-              const { data: transcript } = await supabase
-                .from('transcripts')
-                .select('id, title, source')
-                .eq('id', tid)
-                .single()
-              return transcript
-            })
-          )
+          // Track sources with metadata, embedded in the chunk search and
+          // kept in the order their chunks ranked
+          const transcriptsById = new Map()
+          for (const chunk of topChunks) {
+            if (chunk.transcripts && !transcriptsById.has(chunk.transcript_id)) {
+              transcriptsById.set(chunk.transcript_id, chunk.transcripts)
+            }
+          }
+          chunkSources = [...transcriptsById.values()]
         } else {
           console.log(`[${requestId}] No relevant chunks found`)
           isUnknownQuery = true
@@ -164,27 +234,37 @@ serve(async (req) => {
       }
     }
 
+    // Bookkeeping writes that nothing below reads; they are started as soon
+    // as their data is known and awaited together before responding
+    const pendingWrites: PromiseLike<unknown>[] = []
+
     // Check verified knowledge base
     let verifiedAnswer = null
     if (query && !relevantContext) {
       const { data: knowledge } = await supabase
         .from('verified_knowledge')
-        .select('*')
-        .textSearch('question', query)
+        .select('id, answer, usage_count')
+        .textSearch('question', query, { type: 'websearch' })
         .limit(1)
       
       if (knowledge && knowledge.length > 0) {
         verifiedAnswer = knowledge[0]
         console.log(`[${requestId}] Found verified answer`)
         
-        // Update usage count
-        await supabase
-          .from('verified_knowledge')
-          .update({ usage_count: verifiedAnswer.usage_count + 1 })
-          .eq('id', verifiedAnswer.id)
+        // Update usage count while the answer is generated; query builders
+        // are lazy, so then() is what sends the request now
+        pendingWrites.push(
+          supabase
+            .from('verified_knowledge')
+            .update({ usage_count: verifiedAnswer.usage_count + 1 })
+            .eq('id', verifiedAnswer.id)
+            .then()
+        )
       }
     }
 
+    const conversationContext = await conversationContextPromise
+
     // Prepare enhanced system prompt
     let systemPrompt = SYSTEM_RULES + '\n\n'
     
@@ -217,7 +297,8 @@ serve(async (req) => {
         parts: [{ text: msg.content || msg.parts?.[0]?.text || '' }]
       }))
 
-      const geminiResponse = await fetch(
+      // Transient failures (rate limits, 5xx, network) are retried with backoff
+      const geminiResponse = await fetchWithRetry(
         `https://generativelanguage.googleapis.com/v1beta/models/${GEMINI_MODEL}:generateContent?key=${GEMINI_API_KEY}`,
         {
           method: 'POST',
@@ -232,7 +313,8 @@ serve(async (req) => {
               topK: 40
             }
           })
-        }
+        },
+        { maxRetries: 2, logPrefix: `[${requestId}]`, timeoutMs: GEMINI_TIMEOUT_MS }
       )
 
       if (!geminiResponse.ok) {
@@ -256,28 +338,32 @@ serve(async (req) => {
 
     // Track unknown queries if needed
     if (isUnknownQuery && query) {
-      await supabase.rpc('track_unknown_query', {
-        p_query: query,
-        p_conversation_id: conversationId,
-        p_user_id: user.id
-      })
+      pendingWrites.push(
+        supabase.rpc('track_unknown_query', {
+          p_query: query,
+          p_conversation_id: conversationId,
+          p_user_id: user.id
+        })
+      )
     }
 
     // Update conversation context
     if (conversationId) {
-      await supabase
-        .from('conversation_context')
-        .upsert({
-          conversation_id: conversationId,
-          context_summary: `Last query: ${query}`,
-          key_topics: [/* Extract topics from conversation */],
-          message_count: messages.length,
-          updated_at: new Date().toISOString()
-        })
+      pendingWrites.push(
+        supabase
+          .from('conversation_context')
+          .upsert({
+            conversation_id: conversationId,
+            context_summary: `Last query: ${query}`,
+            key_topics: [/* Extract topics from conversation */],
+            message_count: messages.length,
+            updated_at: new Date().toISOString()
+          })
+      )
     }
 
     // Log enhanced analytics
-    await supabase.from('chat_analytics').insert({
+    pendingWrites.push(supabase.from('chat_analytics').insert({
       conversation_id: conversationId,
       query: query,
       response_length: responseText.length,
@@ -294,7 +380,10 @@ serve(async (req) => {
         model_used: GEMINI_MODEL
       },
       follow_up_questions: followUpQuestions
-    })
+    }))
+
+    // The writes are independent, so their round trips overlap
+    await Promise.all(pendingWrites)
 
     // Build enhanced response
     const response = {
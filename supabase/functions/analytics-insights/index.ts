@@ -1,5 +1,5 @@
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
+import { createAccessTokenCache } from '../_shared/accessToken.ts';
 // --- Configuration ---
 const VERTEX_AI_SERVICE_ACCOUNT = Deno.env.get('VERTEX_AI_SERVICE_ACCOUNT');
 const SUPABASE_URL = Deno.env.get('SUPABASE_URL');
@@ -11,6 +11,13 @@ const REQUEST_TIMEOUT_MS = 45000;
 const MAX_RETRIES = 1;
 const CACHE_DURATION_HOURS = 24; // Cache insights for 24 hours
 const CACHE_TABLE_NAME = 'ai_insights_cache'; // Name of the cache table
+// Admin client for direct DB access (cache table), created once per isolate
+// so warm invocations reuse it instead of building a client per request
+const supabaseAdminClient = SUPABASE_URL && SUPABASE_SERVICE_ROLE_KEY ? createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, {
+  auth: {
+    persistSession: false
+  } // Important for server-side client
+}) : null;
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type'
@@ -94,7 +101,11 @@ async function createJWT(serviceAccount) {
   const encodedSignature = btoa(String.fromCharCode(...new Uint8Array(signatureBuffer))).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
   return `${signatureInput}.${encodedSignature}`;
 }
-async function getVertexAccessToken(serviceAccount) {
+// Access token reused across requests served by this isolate, refreshed a
+// few minutes before it expires, so each request skips the JWT signing and
+// token exchange round trip
+const getVertexAccessToken = createAccessTokenCache(fetchVertexAccessToken);
+async function fetchVertexAccessToken(serviceAccount) {
   try {
     const jwtToken = await createJWT(serviceAccount);
     const tokenResponse = await fetch('https://oauth2.googleapis.com/token', {
@@ -114,7 +125,7 @@ async function getVertexAccessToken(serviceAccount) {
     const tokenData = await tokenResponse.json();
     if (!tokenData.access_token) throw new Error("No access_token received.");
     console.log("Vertex AI Access Token obtained successfully.");
-    return tokenData.access_token;
+    return tokenData;
   } catch (error) {
     console.error("Error getting Vertex Access Token:", error);
     throw new Error(`Vertex Auth Error: ${error.message}`);
@@ -137,7 +148,7 @@ async function fetchWithTimeout(url, options, timeoutMs) {
   }
 }
 // --- Main Handler ---
-serve(async (req)=>{
+Deno.serve(async (req)=>{
   console.log(`\n=== ${new Date().toISOString()} | Analytics Request: ${req.method} ${req.url} ===`);
   if (req.method === 'OPTIONS') return new Response(null, {
     headers: corsHeaders
@@ -151,7 +162,6 @@ serve(async (req)=>{
     }
   });
   let serviceAccount;
-  let supabaseAdminClient; // Use Admin client for direct DB access (cache table)
   try {
     // 1. Validate Env Vars and Service Account
     if (!VERTEX_AI_SERVICE_ACCOUNT || !SUPABASE_URL || !SUPABASE_SERVICE_ROLE_KEY) {
@@ -159,12 +169,6 @@ serve(async (req)=>{
     }
     serviceAccount = validateServiceAccountJson(VERTEX_AI_SERVICE_ACCOUNT);
     console.log(`Using Vertex SA for project: ${serviceAccount.project_id}`);
-    // Initialize Admin Supabase client for cache access
-    supabaseAdminClient = createClient(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, {
-      auth: {
-        persistSession: false
-      } // Important for server-side client
-    });
     // 2. Parse request body (get dateRange, default type)
     const { dateRange: rawDateRange } = await req.json();
     const type = 'general'; // Default analysis type
@@ -1,37 +1,46 @@
 
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2.38.4';
 
+// Read the environment and create the service-role (admin) client once per
+// isolate rather than on every request
+const supabaseUrl = Deno.env.get('SUPABASE_URL');
+const supabaseServiceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+const supabase = supabaseUrl && supabaseServiceKey
+  ? createClient(supabaseUrl, supabaseServiceKey)
+  : null;
+
+// Set once the table is known to exist; the schema does not change at
+// runtime, so later requests in this isolate skip the existence query
+let analyticsTableExists = false;
+
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 };
 
-serve(async (req) => {
+Deno.serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders });
   }
 
   try {
-    // Initialize Supabase client with service role (admin privileges)
-    const supabaseUrl = Deno.env.get('SUPABASE_URL') as string;
-    const supabaseServiceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') as string;
-
-    if (!supabaseUrl || !supabaseServiceKey) {
+    if (!supabase) {
       throw new Error('Missing Supabase URL or service role key');
     }
 
-    const supabase = createClient(supabaseUrl, supabaseServiceKey);
-
     // Check if chat_analytics table already exists
-    const { data: existingTableData, error: existingTableError } = await supabase
-      .from('chat_analytics')
-      .select('id')
-      .limit(1);
+    if (!analyticsTableExists) {
+      const { error: existingTableError } = await supabase
+        .from('chat_analytics')
+        .select('id')
+        .limit(1);
 
-    // If we get a response (even empty), the table exists
-    if (!existingTableError) {
+      // If we get a response (even empty), the table exists
+      analyticsTableExists = !existingTableError;
+    }
+
+    if (analyticsTableExists) {
       return new Response(JSON.stringify({ 
         success: true, 
         message: 'Analytics table already exists',
@@ -190,6 +199,8 @@ serve(async (req) => {
       .select('id')
       .limit(1);
 
+    analyticsTableExists = !verifyError;
+
     if (verifyError) {
       return new Response(JSON.stringify({ 
         success: false, 
@@ -1,5 +1,23 @@
 
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2.39.6";
+import { runWithConcurrency } from "../_shared/concurrency.ts";
+
+// Read the environment and create the service-role client once per isolate
+// rather than on every request
+const supabaseUrl = Deno.env.get('SUPABASE_URL');
+const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+const supabase = supabaseUrl && supabaseKey
+  ? createClient(supabaseUrl, supabaseKey, {
+      auth: { persistSession: false }
+    })
+  : null;
+
+// How many transcript files are downloaded and stored at the same time
+const EXTRACTION_CONCURRENCY = 4;
+
+// Upper bound on downloading one transcript file, so a stalled download
+// cannot hold up the whole run
+const FILE_FETCH_TIMEOUT_MS = 60000;
 
 // Define CORS headers for browser requests
 const corsHeaders = {
@@ -16,18 +34,10 @@ Deno.serve(async (req) => {
   try {
     console.log("[PATH-FIX] Starting transcript path standardization process");
     
-    // Create Supabase client with the service role key
-    const supabaseUrl = Deno.env.get('SUPABASE_URL');
-    const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
-    
-    if (!supabaseUrl || !supabaseKey) {
+    if (!supabase) {
       throw new Error("Missing Supabase environment variables");
     }
     
-    const supabase = createClient(supabaseUrl, supabaseKey, {
-      auth: { persistSession: false }
-    });
-    
     // Get all transcripts with file_path
     console.log("[PATH-FIX] Fetching all transcripts with file paths");
     const { data: transcripts, error } = await supabase
@@ -102,30 +112,33 @@ Deno.serve(async (req) => {
     
     console.log(`[PATH-FIX] Found ${extractionResults.total} transcripts with file paths but no content`);
     
-    // Process each empty transcript
-    for (const transcript of emptyTranscripts || []) {
+    // Process the empty transcripts with a few downloads in flight at once;
+    // fetch reuses pooled connections across them
+    await runWithConcurrency(emptyTranscripts || [], EXTRACTION_CONCURRENCY, async (transcript) => {
       try {
-        if (!transcript.file_path) continue;
-        
+        if (!transcript.file_path) return;
+      
         console.log(`[PATH-FIX] Extracting content for transcript ${transcript.id} from path ${transcript.file_path}`);
-        
+      
         // Get file content
         const { data } = supabase.storage
           .from('transcripts')
           .getPublicUrl(transcript.file_path);
-          
+        
         if (!data || !data.publicUrl) {
           throw new Error("Failed to generate public URL");
         }
-        
+      
         // Fetch file content
-        const response = await fetch(data.publicUrl);
+        const response = await fetch(data.publicUrl, { signal: AbortSignal.timeout(FILE_FETCH_TIMEOUT_MS) });
         if (!response.ok) {
+          // Release the unread body so the connection can be reused
+          await response.body?.cancel();
           throw new Error(`Failed to fetch file: ${response.status} ${response.statusText}`);
         }
-        
+      
         const content = await response.text();
-        
+      
         // Update transcript with content
         const { error: updateError } = await supabase
           .from('transcripts')
@@ -138,11 +151,11 @@ Deno.serve(async (req) => {
             }
           })
           .eq('id', transcript.id);
-          
+        
         if (updateError) {
           throw updateError;
         }
-        
+      
         extractionResults.extracted++;
         console.log(`[PATH-FIX] Successfully extracted content (${content.length} chars) for transcript ${transcript.id}`);
       } catch (err) {
@@ -152,7 +165,7 @@ Deno.serve(async (req) => {
           error: err instanceof Error ? err.message : String(err)
         });
       }
-    }
+    });
     
     console.log(`[PATH-FIX] Content extraction complete: ${extractionResults.extracted} of ${extractionResults.total} transcripts processed, ${extractionResults.errors.length} errors`);
     
@@ -3,8 +3,6 @@
 import { encode } from "https://esm.sh/gpt-tokenizer@2.1.1";
 // @ts-ignore Deno-style import, valid in Supabase Edge Functions
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
-// @ts-ignore Deno standard library
-import { crypto } from "https://deno.land/std@0.168.0/crypto/mod.ts";
 
 // --- Utility Functions ---
 
@@ -12,43 +10,35 @@ import { crypto } from "https://deno.land/std@0.168.0/crypto/mod.ts";
  * Truncates a message transcript to a maximum token count using a tokenizer, keeping the most recent messages.
  * @param messages The array of chat messages to truncate.
  * @param maxTokens The maximum number of tokens allowed in the transcript.
- * @returns The truncated array of chat messages.
+ * @returns The truncated array of chat messages and its token count.
  */
-function truncateTranscript(messages: ChatMessage[], maxTokens: number): ChatMessage[] {
+function truncateTranscript(messages: ChatMessage[], maxTokens: number): { messages: ChatMessage[]; tokenCount: number } {
     let currentTokenCount = 0;
     const truncatedMessages: ChatMessage[] = [];
-    let originalTokenCount = 0;
 
-    // Calculate actual original tokens using the tokenizer
-    messages.forEach(message => {
+    // Encode every message once; the counts serve both the original total and
+    // the truncation pass, and the kept total is returned for the caller
+    const messageTokenCounts = messages.map(message => {
+        // Ensure parts exist and text is defined before encoding
+        const text = message.parts?.[0]?.text;
+        if (typeof text !== 'string') return null;
         try {
-            // Ensure parts exist and text is defined before encoding
-            const textToEncode = message.parts?.[0]?.text;
-            if (typeof textToEncode === 'string') {
-                originalTokenCount += encode(textToEncode).length;
-            }
+            return encode(text).length;
         } catch (e) {
             console.error("Tokenizer error during initial count:", e);
+            return null;
         }
     });
+    const originalTokenCount = messageTokenCounts.reduce((sum, count) => sum + (count ?? 0), 0);
 
     // Iterate backwards through the messages
     for (let i = messages.length - 1; i >= 0; i--) {
         const message = messages[i];
         const messageText = message.parts?.[0]?.text;
-        let messageTokens = 0;
-
-        // Only encode if text exists
-        if (typeof messageText === 'string') {
-            try {
-                messageTokens = encode(messageText).length;
-            } catch (e) {
-                console.error("Tokenizer error during truncation loop:", e);
-                // Skip this message if tokenizer fails
-                continue;
-            }
-        } else {
-            // Skip message if it has no text part
+        const messageTokens = messageTokenCounts[i];
+
+        // Skip messages with no text part or that the tokenizer failed on
+        if (messageTokens === null || typeof messageText !== 'string') {
             continue;
         }
 
@@ -83,19 +73,18 @@ function truncateTranscript(messages: ChatMessage[], maxTokens: number): ChatMes
       console.log(`Transcript truncated: Original tokens: ${originalTokenCount}, Truncated tokens: ${currentTokenCount} (Max: ${maxTokens})`);
     }
 
-    return truncatedMessages;
+    return { messages: truncatedMessages, tokenCount: currentTokenCount };
 }
 
 /**
- * Generates a SHA-256 hash for a given object (typically the request payload).
- * @param obj The object to hash.
+ * Generates a SHA-256 hash for a serialized payload (typically the request payload).
+ * @param jsonString The payload, already serialized as JSON.
  * @returns A promise that resolves to the hex-encoded SHA-256 hash.
  */
-async function generateQueryHash(obj: unknown): Promise<string> {
+async function generateQueryHash(jsonString: string): Promise<string> {
     try {
-        const jsonString = JSON.stringify(obj);
         const msgUint8 = new TextEncoder().encode(jsonString); // encode as (utf-8) Uint8Array
-        const hashBuffer = await crypto.subtle.digest('SHA-256', msgUint8); // hash the message
+        const hashBuffer = await crypto.subtle.digest('SHA-256', msgUint8); // hash the message with the runtime's native WebCrypto
         const hashArray = Array.from(new Uint8Array(hashBuffer)); // convert buffer to byte array
         const hashHex = hashArray.map(b => b.toString(16).padStart(2, '0')).join(''); // convert bytes to hex string
         return hashHex;
@@ -109,8 +98,6 @@ async function generateQueryHash(obj: unknown): Promise<string> {
 // supabase/functions/gemini-chat/index.ts
 /// <reference types="https://deno.land/x/deno/cli/types/dts/index.d.ts" />
 
-// @ts-ignore Deno-style import, valid in Supabase Edge Functions
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import {
     ChatMessage,
     validateChatApiRequest,
@@ -184,7 +171,7 @@ You are an AI assistant designed to have natural conversations. Here are your in
 
 // --- Main Server Handler ---
 
-serve(async (req: Request) => {
+Deno.serve(async (req: Request) => {
   console.log(`=== ${new Date().toISOString()} New request received: ${req.method} ${req.url} ===`);
 
   // --- Handle OPTIONS request (CORS preflight) ---
@@ -224,9 +211,10 @@ serve(async (req: Request) => {
 
   console.log("Handling POST chat request");
   const startTime = Date.now();
+  // created_at is left to the column's DEFAULT NOW() so analytics rows are
+  // stamped by the database clock
   let analyticsData: any = {
-    successful: false,
-    created_at: new Date().toISOString()
+    successful: false
   };
 
   try {
@@ -326,18 +314,10 @@ serve(async (req: Request) => {
 
     // 5. Handle Transcript and Token Limits
     const maxInputTokens = 30000; // Increased for gemini-2.0-flash's larger context window
-    const messagesForAI = truncateTranscript(combinedMessages, maxInputTokens);
+    const { messages: messagesForAI, tokenCount: totalInputTokens } = truncateTranscript(combinedMessages, maxInputTokens);
     console.log(`Prepared ${messagesForAI.length} messages after potential truncation.`);
 
-    // Calculate total tokens for final payload
-    let totalInputTokens = 0;
-    messagesForAI.forEach(msg => {
-        try {
-            totalInputTokens += encode(msg.parts[0]?.text || "").length;
-        } catch (e) {
-            console.error("Tokenizer error during final count:", e);
-        }
-    });
+    // Total tokens for the final payload, as counted during truncation
     console.log(`Total input tokens for Vertex AI (post-truncation): ${totalInputTokens}`);
 
     // Check if payload is too large
@@ -358,11 +338,14 @@ serve(async (req: Request) => {
     const validatedMessages: ChatMessage[] = messagesForAI.filter(msg => msg.role === 'user' || msg.role === 'model');
     console.log(`Sending ${validatedMessages.length} user/model messages to Vertex (after cache check).`);
 
-    // 5. Generate Cache Key
-    const cachePayload = { messages: validatedMessages, enableOnlineSearch };
+    // 5. Generate Cache Key. The messages are serialized once here and the
+    // same JSON is reused for the Vertex request body; the key text matches
+    // JSON.stringify({ messages, enableOnlineSearch }) so cached entries still hit
+    const messagesJson = JSON.stringify(validatedMessages);
+    const cachePayloadJson = `{"messages":${messagesJson},"enableOnlineSearch":${JSON.stringify(enableOnlineSearch)}}`;
     let queryHash: string | null = null;
     try {
-        queryHash = await generateQueryHash(cachePayload);
+        queryHash = await generateQueryHash(cachePayloadJson);
         console.log(`Generated query hash: ${queryHash}`);
     } catch (hashError) {
         console.error("Failed to generate query hash, skipping cache check:", hashError);
@@ -423,7 +406,7 @@ serve(async (req: Request) => {
     const aiCallStartTime = Date.now();
     try {
       // Pass only the user/model messages to the AI function
-      aiResponse = await callVertexAI(validatedMessages);
+      aiResponse = await callVertexAI(validatedMessages, undefined, messagesJson);
       console.log("Vertex AI call successful.");
       
       // Track API time
@@ -21,6 +21,9 @@ export interface ChatApiRequest {
 export const REQUEST_TIMEOUT_MS = 30000; // 30 seconds timeout for API requests
 export const MAX_RETRIES = 3; // Maximum number of retries for failed requests
 
+// Roles accepted in chat messages, as a set for constant-time lookups
+const VALID_MESSAGE_ROLES = new Set(['user', 'model', 'system']);
+
 // Helper function to fetch with timeout
 export async function fetchWithTimeout(url: string, options: RequestInit, timeoutMs: number): Promise<Response> {
     const controller = new AbortController();
@@ -75,7 +78,7 @@ export function validateChatApiRequest(requestData: any): { isValid: boolean; er
     if (requestData.messages && Array.isArray(requestData.messages)) {
         for (let i = 0; i < requestData.messages.length; i++) {
             const msg = requestData.messages[i];
-            if (!msg.role || !["user", "model", "system"].includes(msg.role)) {
+            if (!msg.role || !VALID_MESSAGE_ROLES.has(msg.role)) {
                 return { 
                     isValid: false, 
                     error: `Message at index ${i} has an invalid 'role'. Must be 'user', 'model', or 'system'.`,
@@ -110,7 +113,7 @@ export function normalizeMessage(message: any): ChatMessage {
     };
 
     // Copy role if it exists and is valid
-    if (message.role && ['user', 'model', 'system'].includes(message.role)) {
+    if (message.role && VALID_MESSAGE_ROLES.has(message.role)) {
         normalizedMessage.role = message.role;
     }
 
@@ -185,6 +188,25 @@ export function countTokens(text: string): number {
     }
 }
 
+// Paragraph boundary: a run of two or more newlines
+const PARAGRAPH_BREAK_PATTERN = /\n\n+/g;
+
+/**
+ * Lazily yield the paragraphs of a text, the same pieces as text.split(/\n\n+/),
+ * without first allocating the full array of paragraphs
+ * @param text The text to split
+ */
+function* iterateParagraphs(text: string): Generator<string> {
+    const pattern = new RegExp(PARAGRAPH_BREAK_PATTERN);
+    let start = 0;
+    let match: RegExpExecArray | null;
+    while ((match = pattern.exec(text)) !== null) {
+        yield text.slice(start, match.index);
+        start = match.index + match[0].length;
+    }
+    yield text.slice(start);
+}
+
 /**
  * Process transcripts for a given query to find relevant content
  * @param query The user query to search for in transcripts
@@ -223,13 +245,15 @@ export async function searchTranscriptsForQuery(
         
         console.log(`Found ${transcripts.length} transcripts to search through`);
         
+        // The query terms and their patterns depend only on the query, so
+        // they are built once here rather than again for every transcript
+        const normalizedQuery = query.toLowerCase();
+        const queryTerms = normalizedQuery.split(/\s+/).filter(term => term.length > 2);
+        const termPatterns = queryTerms.map(term => new RegExp(`\\b${term}\\b`, 'gi'));
+        
         // Simple relevance scoring
         const scoredTranscripts = transcripts.map(transcript => {
             const normalizedContent = transcript.content.toLowerCase();
-            const normalizedQuery = query.toLowerCase();
-            
-            // Basic relevance score: occurrences of query terms
-            const queryTerms = normalizedQuery.split(/\s+/).filter(term => term.length > 2);
             
             let score = 0;
             let exactMatch = false;
@@ -240,19 +264,19 @@ export async function searchTranscriptsForQuery(
                 exactMatch = true;
             }
             
-            // Check for individual term matches
-            queryTerms.forEach(term => {
-                const matches = normalizedContent.match(new RegExp(`\\b${term}\\b`, 'gi'));
+            // Check for individual term matches; match() with a global
+            // pattern always starts from the beginning, so reuse is safe
+            for (const pattern of termPatterns) {
+                const matches = normalizedContent.match(pattern);
                 if (matches) {
                     score += matches.length * 10;
                 }
-            });
+            }
             
             // Boost score based on context matches
             if (!exactMatch && queryTerms.length > 1) {
                 // Check for paragraphs containing multiple query terms
-                const paragraphs = normalizedContent.split(/\n\n+/);
-                paragraphs.forEach(paragraph => {
+                for (const paragraph of iterateParagraphs(normalizedContent)) {
                     let termsFound = 0;
                     queryTerms.forEach(term => {
                         if (paragraph.includes(term)) {
@@ -263,7 +287,7 @@ export async function searchTranscriptsForQuery(
                     if (termsFound > 1) {
                         score += termsFound * 15;
                     }
-                });
+                }
             }
             
             return {
@@ -289,7 +313,6 @@ export async function searchTranscriptsForQuery(
         const extractedContent = relevantTranscripts.map(transcript => {
             // Extract the most relevant paragraphs
             const paragraphs = transcript.content.split(/\n\n+/);
-            const normalizedQuery = query.toLowerCase();
             
             // Score each paragraph for relevance
             const scoredParagraphs = paragraphs.map(paragraph => {
@@ -301,8 +324,7 @@ export async function searchTranscriptsForQuery(
                     score += 50;
                 }
                 
-                // Check for term matches
-                const queryTerms = normalizedQuery.split(/\s+/).filter(term => term.length > 2);
+                // Check for term matches, reusing the query terms split above
                 queryTerms.forEach(term => {
                     if (normalizedParagraph.includes(term)) {
                         score += 10;
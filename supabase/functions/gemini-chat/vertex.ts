@@ -9,6 +9,39 @@ import { getVertexAccessToken } from "./auth.ts";
 const VERTEX_AI_SERVICE_ACCOUNT = Deno.env.get('VERTEX_AI_SERVICE_ACCOUNT');
 const MAX_RETRIES = 3; // Increased retries for API calls
 
+// Full request payloads (the whole prompt, including transcript context) are
+// only serialized into the logs when DEBUG_LOGGING is enabled
+const DEBUG_LOGGING = Deno.env.get('DEBUG_LOGGING') === 'true';
+
+const VERTEX_LOCATION = "us-central1";
+// Using gemini-2.0-flash consistently
+const VERTEX_MODEL_ID = "gemini-2.0-flash";
+const VERTEX_API_VERSION = "v1";
+
+// The endpoint only depends on the service account's project, so it is
+// built on first use and reused for the life of the isolate
+let vertexEndpoint: string | null = null;
+
+// Safety settings never change, so they are serialized once per isolate
+const SAFETY_SETTINGS_JSON = JSON.stringify([
+    {
+        category: "HARM_CATEGORY_DANGEROUS_CONTENT",
+        threshold: "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        category: "HARM_CATEGORY_HATE_SPEECH",
+        threshold: "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        category: "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+        threshold: "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        category: "HARM_CATEGORY_HARASSMENT",
+        threshold: "BLOCK_MEDIUM_AND_ABOVE"
+    }
+]);
+
 // Define the structure for the Vertex AI response
 interface VertexAIResponse {
     candidates: Array<{
@@ -25,12 +58,43 @@ interface VertexAIResponse {
     };
 }
 
+/**
+ * Builds the generateContent endpoint from the service account's project ID,
+ * parsing the service account only the first time it is needed.
+ *
+ * @throws Error if the service account is missing or has no project_id.
+ */
+function getVertexEndpoint(): string {
+    if (vertexEndpoint) return vertexEndpoint;
+
+    let projectId = "";
+    try {
+        if (!VERTEX_AI_SERVICE_ACCOUNT) {
+            throw new Error("VERTEX_AI_SERVICE_ACCOUNT is not set");
+        }
+        const serviceAccount = JSON.parse(VERTEX_AI_SERVICE_ACCOUNT);
+        projectId = serviceAccount.project_id;
+        if (!projectId) {
+            throw new Error("No project_id found in service account");
+        }
+        console.log("Using project ID from service account:", projectId);
+    } catch (error) {
+        console.error("Error extracting project ID:", error);
+        throw new Error(`Failed to extract project ID: ${error.message}`);
+    }
+
+    vertexEndpoint = `https://${VERTEX_LOCATION}-aiplatform.googleapis.com/${VERTEX_API_VERSION}/projects/${projectId}/locations/${VERTEX_LOCATION}/publishers/google/models/${VERTEX_MODEL_ID}:generateContent`;
+    console.log(`Prepared Vertex AI endpoint using model ${VERTEX_MODEL_ID}:`, vertexEndpoint);
+    return vertexEndpoint;
+}
+
 /**
  * Function to call Vertex AI Prediction API (Gemini model endpoint)
  * with improved error handling and retry logic.
  *
  * @param messages An array of ChatMessage objects, filtered to include only 'user' and 'model' roles.
  * @param temperature The sampling temperature (default 0.7).
+ * @param messagesJson The messages already serialized as JSON, if the caller has them; reused across retries.
  * @param retryCount The current retry attempt number (internal use).
  * @returns A Promise resolving to the VertexAIResponse structure.
  * @throws Error if the API call fails after retries or if configuration is invalid.
@@ -38,83 +102,46 @@ interface VertexAIResponse {
 export async function callVertexAI(
     messages: ChatMessage[],
     temperature = 0.7,
+    messagesJson = JSON.stringify(messages),
     retryCount = 0
 ): Promise<VertexAIResponse> {
     try {
         console.log(`Calling Vertex AI (attempt ${retryCount + 1}/${MAX_RETRIES + 1})`);
-        console.log("callVertexAI - Input messages:", JSON.stringify(messages.map(m => ({ role: m.role, textLength: m.parts[0]?.text?.length ?? 0 })), null, 2));
+        if (DEBUG_LOGGING) {
+            console.debug("callVertexAI - Input messages:", JSON.stringify(messages.map(m => ({ role: m.role, textLength: m.parts[0]?.text?.length ?? 0 }))));
+        }
 
         // 1. Get Access Token
         const accessToken = await getVertexAccessToken(); // Assumes getVertexAccessToken handles its own errors
 
-        // 2. Get Project ID
-        let projectId = "";
-        try {
-            if (!VERTEX_AI_SERVICE_ACCOUNT) {
-                throw new Error("VERTEX_AI_SERVICE_ACCOUNT is not set");
-            }
-            const serviceAccount = JSON.parse(VERTEX_AI_SERVICE_ACCOUNT);
-            projectId = serviceAccount.project_id;
-            if (!projectId) {
-                throw new Error("No project_id found in service account");
-            }
-            console.log("Using project ID from service account:", projectId);
-        } catch (error) {
-            console.error("Error extracting project ID:", error);
-            throw new Error(`Failed to extract project ID: ${error.message}`);
-        }
+        // 2. Get the API endpoint for the service account's project
+        const endpoint = getVertexEndpoint();
 
-        // 3. Construct API Endpoint URL
-        const VERTEX_LOCATION = "us-central1"; 
-        // Using gemini-2.0-flash consistently
-        const VERTEX_MODEL_ID = "gemini-2.0-flash";
-        const VERTEX_API_VERSION = "v1"; 
-        const endpoint = `https://${VERTEX_LOCATION}-aiplatform.googleapis.com/${VERTEX_API_VERSION}/projects/${projectId}/locations/${VERTEX_LOCATION}/publishers/google/models/${VERTEX_MODEL_ID}:generateContent`;
-
-        console.log(`Prepared Vertex AI request to endpoint using model ${VERTEX_MODEL_ID}:`, endpoint);
-
-        // 4. Prepare Request Body
-        const requestBody = {
-            contents: messages,
-            generationConfig: {
-                temperature: temperature,
-                maxOutputTokens: 8192, // Increased token limit for gemini-2.0 models
-                topP: 0.95,
-                topK: 40
-            },
-            safetySettings: [
-                {
-                    category: "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    threshold: "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    category: "HARM_CATEGORY_HATE_SPEECH",
-                    threshold: "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    category: "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    threshold: "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    category: "HARM_CATEGORY_HARASSMENT",
-                    threshold: "BLOCK_MEDIUM_AND_ABOVE"
-                }
-            ]
+        // 3. Prepare Request Body around the already-serialized messages
+        const generationConfig = {
+            temperature: temperature,
+            maxOutputTokens: 8192, // Increased token limit for gemini-2.0 models
+            topP: 0.95,
+            topK: 40
         };
+        const requestJson = `{"contents":${messagesJson},"generationConfig":${JSON.stringify(generationConfig)},"safetySettings":${SAFETY_SETTINGS_JSON}}`;
+        if (DEBUG_LOGGING) {
+            console.debug("Sending request to Vertex AI with body:", requestJson);
+        } else {
+            console.log(`Sending request to Vertex AI (${messages.length} messages, ${requestJson.length} chars)`);
+        }
 
-        console.log("Sending request to Vertex AI with body:", JSON.stringify(requestBody, null, 2));
-
-        // 5. Make API Call with Timeout and Retries
+        // 4. Make API Call with Timeout and Retries
         const response = await fetchWithTimeout(endpoint, {
             method: 'POST',
             headers: {
                 'Authorization': `Bearer ${accessToken}`,
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify(requestBody)
+            body: requestJson
         }, REQUEST_TIMEOUT_MS);
 
-        // 6. Handle API Response
+        // 5. Handle API Response
         if (!response.ok) {
             const errorText = await response.text();
             console.error(`Vertex AI API error (${response.status}):`, errorText);
@@ -125,20 +152,15 @@ export async function callVertexAI(
                 console.log(`Retrying due to error ${response.status} (attempt ${retryCount + 2}/${MAX_RETRIES + 1})`);
                 const delay = Math.pow(2, retryCount) * 1500 + Math.random() * 1000; // Increased backoff
                 await new Promise(resolve => setTimeout(resolve, delay));
-                return callVertexAI(messages, temperature, retryCount + 1); // Recursive call
+                return callVertexAI(messages, temperature, messagesJson, retryCount + 1); // Recursive call
             }
             // Throw specific error for non-retriable API issues
             throw new Error(`Vertex AI API error: ${response.status} ${response.statusText}. Response: ${errorText}`);
         }
 
-        // 7. Parse Successful Response
+        // 6. Parse Successful Response
         const data: VertexAIResponse = await response.json();
-        console.log("Successfully received response from Vertex AI:", 
-            JSON.stringify({
-                candidatesCount: data.candidates?.length || 0,
-                hasContent: !!data.candidates?.[0]?.content,
-                tokenInfo: data.usageMetadata || "Not provided"
-            }, null, 2));
+        console.log(`Successfully received response from Vertex AI: ${data.candidates?.length || 0} candidates, total tokens ${data.usageMetadata?.totalTokenCount ?? 'not provided'}`);
 
         // Basic validation of the response structure
         if (!data.candidates || !Array.isArray(data.candidates) || data.candidates.length === 0 ||
@@ -164,7 +186,7 @@ export async function callVertexAI(
             console.log(`Retrying due to connection error "${error.message}" (attempt ${retryCount + 2}/${MAX_RETRIES + 1})`);
             const delay = Math.pow(2, retryCount) * 1500 + Math.random() * 1000;
             await new Promise(resolve => setTimeout(resolve, delay));
-            return callVertexAI(messages, temperature, retryCount + 1); // Recursive call
+            return callVertexAI(messages, temperature, messagesJson, retryCount + 1); // Recursive call
         }
 
         // If we've exhausted retries or have a non-retriable error:
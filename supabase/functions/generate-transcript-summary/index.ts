@@ -1,7 +1,9 @@
 
 // supabase/functions/generate-transcript-summary/index.ts
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
+import { fetchWithRetry } from "../_shared/retry.ts";
+import { createAccessTokenCache, type AccessTokenResponse } from "../_shared/accessToken.ts";
+import { hashContent } from "../_shared/contentHash.ts";
 
 // Get Vertex AI service account from environment variables
 const VERTEX_AI_SERVICE_ACCOUNT = Deno.env.get('VERTEX_AI_SERVICE_ACCOUNT');
@@ -25,7 +27,19 @@ const corsHeaders = {
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 };
 
-async function getVertexAccessToken(): Promise<string> {
+// Per-attempt limit, retries and retry wait for a summary call. Whole
+// transcripts take a while, but every attempt has to finish inside the edge
+// function's 150s wall-clock limit: 2 x 60s attempts plus at most 5s of
+// waiting leaves room for the token exchange and database work.
+const SUMMARY_TIMEOUT_MS = 60000;
+const SUMMARY_MAX_RETRIES = 1;
+const SUMMARY_MAX_RETRY_DELAY_MS = 5000;
+
+// Access token reused across requests served by this isolate, so a burst of
+// summaries does not sign a JWT and call the token endpoint for each one
+const getVertexAccessToken = createAccessTokenCache(fetchVertexAccessToken);
+
+async function fetchVertexAccessToken(): Promise<AccessTokenResponse> {
   try {
     // Parse the service account JSON
     const serviceAccount = JSON.parse(VERTEX_AI_SERVICE_ACCOUNT);
@@ -107,14 +121,35 @@ async function getVertexAccessToken(): Promise<string> {
       throw new Error(`Failed to get access token: ${tokenResponse.status} - ${errorText}`);
     }
 
-    const tokenData = await tokenResponse.json();
-    return tokenData.access_token;
+    return await tokenResponse.json();
   } catch (error) {
     console.error('Error getting access token:', error);
     throw error;
   }
 }
 
+// Helper function to count the pieces content.split(/\s+/) would produce,
+// scanning in place instead of allocating a string for every word
+function countWords(content: string): number {
+  let pieces = 1;
+  let inWhitespace = false;
+  for (let i = 0; i < content.length; i++) {
+    const whitespace = isWhitespace(content.charCodeAt(i));
+    if (whitespace && !inWhitespace) {
+      pieces++;
+    }
+    inWhitespace = whitespace;
+  }
+  return pieces;
+}
+
+// Same characters as \s in a JavaScript regular expression
+function isWhitespace(code: number): boolean {
+  return code === 32 || (code >= 9 && code <= 13) || code === 0xa0 || code === 0x1680 ||
+    (code >= 0x2000 && code <= 0x200a) || code === 0x2028 || code === 0x2029 ||
+    code === 0x202f || code === 0x205f || code === 0x3000 || code === 0xfeff;
+}
+
 // Helper function to convert PEM format to ArrayBuffer
 function pemToArrayBuffer(pem: string): ArrayBuffer {
   // Remove header, footer, and newlines
@@ -176,8 +211,9 @@ async function generateSummary(content: string, title: string, source: string):
       ${content}
     `;
     
-    // Call Vertex AI with enhanced configuration
-    const response = await fetch(endpoint, {
+    // Call Vertex AI with enhanced configuration; batch summarization hits
+    // rate limits, so transient failures are retried with backoff
+    const response = await fetchWithRetry(endpoint, {
       method: 'POST',
       headers: {
         'Authorization': `Bearer ${accessToken}`,
@@ -197,6 +233,11 @@ async function generateSummary(content: string, title: string, source: string):
           maxOutputTokens: 4096,
         }
       }),
+    }, {
+      logPrefix: '[SUMMARY]',
+      timeoutMs: SUMMARY_TIMEOUT_MS,
+      maxRetries: SUMMARY_MAX_RETRIES,
+      maxDelayMs: SUMMARY_MAX_RETRY_DELAY_MS
     });
 
     if (!response.ok) {
@@ -268,7 +309,7 @@ async function generateSummary(content: string, title: string, source: string):
 }
 
 // Main handler function
-serve(async (req: Request) => {
+Deno.serve(async (req: Request) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders });
@@ -331,26 +372,54 @@ serve(async (req: Request) => {
       );
     }
 
-    // Generate summary
-    console.log(`Generating summary for transcript: ${transcript.title}`);
-    const { summary, keyPoints } = await generateSummary(
-      transcript.content, 
-      transcript.title, 
-      transcript.source || 'unknown source'
-    );
+    // Reuse the summary of a transcript with identical content instead of
+    // calling the model again (e.g. the same file uploaded twice). The title
+    // and source are part of the prompt, so they have to match as well; the
+    // matching transcript is joined only to filter on them.
+    const contentHash = await hashContent(transcript.content);
+    let matchingSummaryQuery = supabase
+      .from('transcript_summaries')
+      .select('summary, key_points, token_count, model_used, transcripts!inner()')
+      .eq('content_hash', contentHash);
+    matchingSummaryQuery = transcript.title == null
+      ? matchingSummaryQuery.is('transcripts.title', null)
+      : matchingSummaryQuery.eq('transcripts.title', transcript.title);
+    matchingSummaryQuery = transcript.source == null
+      ? matchingSummaryQuery.is('transcripts.source', null)
+      : matchingSummaryQuery.eq('transcripts.source', transcript.source);
+    const { data: matchingSummary } = await matchingSummaryQuery
+      .limit(1)
+      .maybeSingle();
+
+    let summaryRow;
+    if (matchingSummary) {
+      console.log(`Reusing summary of identical content, title and source for transcript ${transcriptId}`);
+      summaryRow = matchingSummary;
+    } else {
+      // Generate summary
+      console.log(`Generating summary for transcript: ${transcript.title}`);
+      const { summary, keyPoints } = await generateSummary(
+        transcript.content, 
+        transcript.title, 
+        transcript.source || 'unknown source'
+      );
 
-    // Calculate token count (approximate)
-    const tokenCount = Math.ceil(transcript.content.split(/\s+/).length * 1.3);
+      summaryRow = {
+        summary: summary,
+        key_points: keyPoints,
+        // Calculate token count (approximate)
+        token_count: Math.ceil(countWords(transcript.content) * 1.3),
+        model_used: 'gemini-1.5-pro'
+      };
+    }
 
-    // Save summary
+    // Save summary; the insert trigger also marks the transcript as summarized
     const { data: savedSummary, error: saveError } = await supabase
       .from('transcript_summaries')
       .insert({
+        ...summaryRow,
         transcript_id: transcriptId,
-        summary: summary,
-        key_points: keyPoints,
-        token_count: tokenCount,
-        model_used: 'gemini-1.5-pro'
+        content_hash: contentHash
       })
       .select()
       .single();
@@ -360,12 +429,6 @@ serve(async (req: Request) => {
       throw new Error(`Failed to save summary: ${saveError.message}`);
     }
 
-    // Mark transcript as summarized
-    await supabase
-      .from('transcripts')
-      .update({ is_summarized: true })
-      .eq('id', transcriptId);
-
     console.log(`Successfully generated and saved summary for transcript ${transcriptId}`);
     
     return new Response(
@@ -1,5 +1,8 @@
 
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2.39.7'
+import { iterateParentChunks, iterateHierarchicalChunks, TranscriptChunk } from '../_shared/chunking.ts'
+import { hashContent, hasStoredChunks } from '../_shared/contentHash.ts'
+import { runWithConcurrency } from '../_shared/concurrency.ts'
 
 // Create a Supabase client with the Auth context of the function
 const supabaseAdmin = createClient(
@@ -13,22 +16,18 @@ const corsHeaders = {
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 }
 
-// Define proper types for metadata and chunks
-interface ChunkMetadata {
-  position: number;
-  parent_id: string | null;
-  chunk_strategy: string;
-  [key: string]: any;
-}
+// Headers for JSON responses, built once per isolate rather than per response
+const jsonHeaders = { ...corsHeaders, 'Content-Type': 'application/json' }
 
-interface TranscriptChunk {
-  id: string;
-  content: string;
-  transcript_id: string;
-  chunk_type: 'parent' | 'child';
-  topic: string | null;
-  metadata: ChunkMetadata;
-}
+// Pattern used to normalise content, compiled once per isolate
+const WHITESPACE_PATTERN = /\s+/g;
+
+// Chunk rows per insert request and how many insert requests run at once
+const CHUNK_INSERT_BATCH_SIZE = Number(Deno.env.get('CHUNK_INSERT_BATCH_SIZE')) || 50;
+const CHUNK_INSERT_CONCURRENCY = Number(Deno.env.get('CHUNK_INSERT_CONCURRENCY')) || 4;
+
+// Upper bound on downloading a transcript file, body included
+const FILE_FETCH_TIMEOUT_MS = 60000;
 
 Deno.serve(async (req) => {
   // Handle CORS preflight requests
@@ -58,7 +57,7 @@ Deno.serve(async (req) => {
         }
       }), { 
         status: 200,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
@@ -71,7 +70,7 @@ Deno.serve(async (req) => {
         error: "No transcript ID provided" 
       }), { 
         status: 400,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
@@ -90,7 +89,7 @@ Deno.serve(async (req) => {
         error: `Failed to fetch transcript: ${fetchError?.message || 'Not found'}` 
       }), { 
         status: 404,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
@@ -102,15 +101,11 @@ Deno.serve(async (req) => {
       if (!transcript.content && transcript.file_path) {
         const fileContent = await getFileContent(transcript.file_path);
         if (fileContent) {
-          // Update transcript with content from file
-          await supabaseAdmin
-            .from('transcripts')
-            .update({ content: fileContent })
-            .eq('id', transcript_id);
-          
-          console.log(`[PROCESS] Updated transcript ${transcript_id} with content from file`);
-          
-          // Update our local copy of the transcript with the new content
+          // Keep the file content locally only; the final update below writes
+          // the processed content, so the transcript row is written once
+          // rather than uploading the full text twice. If processing fails
+          // first, the next run reads the file from storage again.
+          console.log(`[PROCESS] Loaded content from file for transcript ${transcript_id}`);
           transcript.content = fileContent;
         }
       }
@@ -120,11 +115,24 @@ Deno.serve(async (req) => {
       
       // Simple processing example: Remove excessive whitespace
       processedContent = processedContent
-        .replace(/\s+/g, ' ')
+        .replace(WHITESPACE_PATTERN, ' ')
         .trim();
       
+      // Skip re-chunking when this exact content was already chunked and its
+      // chunks are still stored (e.g. the same transcript submitted again)
+      const previousMetadata = (transcript.metadata as Record<string, any>) || {};
+      const contentHash = processedContent ? await hashContent(processedContent) : null;
+      let chunksReplaced = false;
+      let chunksStored = contentHash !== null &&
+        previousMetadata.content_hash === contentHash &&
+        await hasStoredChunks(supabaseAdmin, transcript_id);
+      
+      if (chunksStored) {
+        console.log(`[PROCESS] Content of transcript ${transcript_id} unchanged since last chunking, skipping`);
+      }
+      
       // 3. NEW: Apply hierarchical chunking to the transcript
-      if (processedContent) {
+      if (processedContent && !chunksStored) {
         console.log(`[PROCESS] Applying hierarchical chunking to transcript ${transcript_id}`);
         
         try {
@@ -138,29 +146,37 @@ Deno.serve(async (req) => {
             console.error(`[PROCESS] Error deleting existing chunks for transcript ${transcript_id}:`, deleteError);
             throw new Error(`Failed to delete existing chunks: ${deleteError.message}`);
           }
+          chunksReplaced = true;
           
-          // Create parent chunks
-          const parentChunks = await createParentChunks(processedContent);
-          console.log(`[PROCESS] Created ${parentChunks.length} parent chunks for transcript ${transcript_id}`);
+          // Chunk lazily: parents and their children are produced as the insert
+          // workers pull them, so only the batches in flight are held in memory
+          const chunkStream = iterateHierarchicalChunks(iterateParentChunks(processedContent), transcript);
+          let batchCount = 0;
+          let chunkCount = 0;
           
-          // Create hierarchical chunks (parents and children)
-          const hierarchicalChunks = await createHierarchicalChunks(parentChunks, transcript);
-          console.log(`[PROCESS] Created ${hierarchicalChunks.length} total hierarchical chunks for transcript ${transcript_id}`);
-          
-          // Store the chunks in batches
-          const BATCH_SIZE = 50;
-          for (let i = 0; i < hierarchicalChunks.length; i += BATCH_SIZE) {
-            const batch = hierarchicalChunks.slice(i, i + BATCH_SIZE);
-            const { error } = await supabaseAdmin
-              .from('chunks')
-              .insert(batch);
-            
-            if (error) {
-              console.error(`[PROCESS] Error storing chunks batch ${i / BATCH_SIZE + 1}:`, error);
-              throw new Error(`Failed to store chunks: ${error.message}`);
+          // Store the chunks in batches, keeping a few batch inserts in flight
+          // at once instead of waiting on each round trip in turn. Once any
+          // insert fails, no further batches are pulled or inserted, so no
+          // chunks are written after the failure has been handled below.
+          await runWithConcurrency(
+            iterateChunkBatches(chunkStream, CHUNK_INSERT_BATCH_SIZE),
+            CHUNK_INSERT_CONCURRENCY,
+            async (batch) => {
+              const batchNumber = ++batchCount;
+              chunkCount += batch.length;
+              const { error } = await supabaseAdmin
+                .from('chunks')
+                .insert(batch);
+              
+              if (error) {
+                console.error(`[PROCESS] Error storing chunks batch ${batchNumber}:`, error);
+                throw new Error(`Failed to store chunks: ${error.message}`);
+              }
             }
-          }
+          );
           
+          console.log(`[PROCESS] Created ${chunkCount} total hierarchical chunks for transcript ${transcript_id}`);
+          chunksStored = true;
           console.log(`[PROCESS] Successfully stored all chunks for transcript ${transcript_id}`);
         } catch (chunkError) {
           console.error(`[PROCESS] Chunking error for transcript ${transcript_id}:`, chunkError);
@@ -170,10 +186,14 @@ Deno.serve(async (req) => {
       
       // Update the transcript as processed
       const updatedMetadata = {
-        ...(transcript.metadata as Record<string, any> || {}),
+        ...previousMetadata,
         processing_completed_at: new Date().toISOString(),
         chunking_strategy: 'hierarchical',
-        processing_success: true
+        processing_success: true,
+        // Only record the hash once its chunks are safely stored
+        content_hash: chunksStored ? contentHash : null,
+        // Chunks from process-with-hierarchical-chunking no longer match its hash
+        ...(chunksReplaced ? { hierarchical_content_hash: null } : {})
       };
       
       const { error: updateError } = await supabaseAdmin
@@ -197,7 +217,7 @@ Deno.serve(async (req) => {
         processing_status: "completed"
       }), { 
         status: 200,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
       
     } catch (processingError) {
@@ -226,7 +246,7 @@ Deno.serve(async (req) => {
         transcript_id
       }), { 
         status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
@@ -236,7 +256,7 @@ Deno.serve(async (req) => {
       error: error.message 
     }), { 
       status: 500,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+      headers: jsonHeaders
     });
   }
 });
@@ -253,6 +273,22 @@ async function checkDatabaseConnection() {
   }
 }
 
+// Helper function to group a lazy chunk stream into insert batches of up to
+// `size` rows, pulling chunks only as batches are requested
+function* iterateChunkBatches(chunks: Iterable<TranscriptChunk>, size: number): Generator<TranscriptChunk[]> {
+  let batch: TranscriptChunk[] = [];
+  for (const chunk of chunks) {
+    batch.push(chunk);
+    if (batch.length >= size) {
+      yield batch;
+      batch = [];
+    }
+  }
+  if (batch.length > 0) {
+    yield batch;
+  }
+}
+
 // Helper function to get file content from storage
 async function getFileContent(filePath: string): Promise<string | null> {
   try {
@@ -275,10 +311,12 @@ async function getFileContent(filePath: string): Promise<string | null> {
     }
     
     // Fetch the file content
-    const response = await fetch(data.publicUrl);
+    const response = await fetch(data.publicUrl, { signal: AbortSignal.timeout(FILE_FETCH_TIMEOUT_MS) });
     
     if (!response.ok) {
       console.error(`[PROCESS] Error fetching file: ${response.status} ${response.statusText}`);
+      // Release the unread body so the connection can be reused
+      await response.body?.cancel();
       return null;
     }
     
@@ -291,92 +329,3 @@ async function getFileContent(filePath: string): Promise<string | null> {
     return null;
   }
 }
-
-/**
- * Create large, topically coherent parent chunks
- */
-async function createParentChunks(content: string): Promise<any[]> {
-  // Create large, topically coherent parent chunks
-  // This is a simplified implementation - in production, you'd use more sophisticated NLP
-  const paragraphs = content.split('\n\n');
-  
-  // Group paragraphs into topically related sections
-  let currentTopic = '';
-  let currentChunk = '';
-  const parentChunks = [];
-  
-  for (const paragraph of paragraphs) {
-    // For this simplified implementation, we'll just use paragraph breaks
-    // In a real system, you'd use NLP to detect topic changes
-    if (currentChunk.length > 1500) {
-      parentChunks.push({
-        content: currentChunk,
-        topic: currentTopic || 'Unknown',
-      });
-      currentChunk = paragraph;
-      // Extract topic from first sentence for demo purposes
-      currentTopic = paragraph.split('.')[0];
-    } else {
-      currentChunk += '\n\n' + paragraph;
-    }
-  }
-  
-  // Add the last chunk
-  if (currentChunk) {
-    parentChunks.push({
-      content: currentChunk,
-      topic: currentTopic || 'Unknown',
-    });
-  }
-  
-  return parentChunks;
-}
-
-/**
- * Create child chunks for each parent
- */
-async function createHierarchicalChunks(parentChunks: any[], transcript: any): Promise<TranscriptChunk[]> {
-  // Create child chunks for each parent
-  const hierarchicalChunks: TranscriptChunk[] = [];
-  
-  for (let i = 0; i < parentChunks.length; i++) {
-    const parentChunk = parentChunks[i];
-    const parentId = `${transcript.id}-parent-${i}`;
-    
-    // Add parent chunk
-    hierarchicalChunks.push({
-      id: parentId,
-      content: parentChunk.content,
-      transcript_id: transcript.id,
-      chunk_type: 'parent',
-      topic: parentChunk.topic,
-      metadata: {
-        position: i,
-        parent_id: null,
-        chunk_strategy: 'hierarchical',
-      }
-    });
-    
-    // Create child chunks
-    const sentences = parentChunk.content.match(/[^.!?]+[.!?]+/g) || [];
-    for (let j = 0; j < sentences.length; j++) {
-      const sentence = sentences[j].trim();
-      if (sentence.split(' ').length > 5) { // Only include substantive sentences
-        hierarchicalChunks.push({
-          id: `${transcript.id}-child-${i}-${j}`,
-          content: sentence,
-          transcript_id: transcript.id,
-          chunk_type: 'child',
-          topic: parentChunk.topic,
-          metadata: {
-            position: j,
-            parent_id: parentId,
-            chunk_strategy: 'hierarchical',
-          }
-        });
-      }
-    }
-  }
-  
-  return hierarchicalChunks;
-}
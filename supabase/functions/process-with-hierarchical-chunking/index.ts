@@ -3,13 +3,34 @@
 // This function processes a transcript with hierarchical chunking strategy
 
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2.39.6";
-import { v4 as uuidv4 } from "https://esm.sh/uuid@9.0.0";
+import { createReprocessingChunks, iterateInsertBatches } from "../_shared/chunking.ts";
+import { hashContent, hasStoredChunks } from "../_shared/contentHash.ts";
+import { runWithConcurrency } from "../_shared/concurrency.ts";
+
+// Pattern used to split paragraphs, compiled once per isolate
+const PARAGRAPH_SPLIT_PATTERN = /\n\n+/;
+
+// How many bulk chunk inserts are kept in flight at once
+const CHUNK_INSERT_CONCURRENCY = Number(Deno.env.get('CHUNK_INSERT_CONCURRENCY')) || 4;
+
+// Create the service-role client once per isolate so warm invocations
+// reuse its connections instead of building a new client per request
+const supabaseUrl = Deno.env.get('SUPABASE_URL');
+const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+const supabase = supabaseUrl && supabaseKey
+  ? createClient(supabaseUrl, supabaseKey, {
+      auth: { persistSession: false }
+    })
+  : null;
 
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 };
 
+// Headers for JSON responses, built once per isolate rather than per response
+const jsonHeaders = { ...corsHeaders, 'Content-Type': 'application/json' };
+
 Deno.serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
@@ -23,29 +44,22 @@ Deno.serve(async (req) => {
     if (!transcriptId) {
       return new Response(
         JSON.stringify({ error: 'Transcript ID is required' }),
-        { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 400 }
+        { headers: jsonHeaders, status: 400 }
       );
     }
 
     console.log(`[HIERARCHICAL] Received request to process transcript ${transcriptId} with hierarchical chunking`);
 
-    // Create Supabase client
-    const supabaseUrl = Deno.env.get('SUPABASE_URL');
-    const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
-    
-    if (!supabaseUrl || !supabaseKey) {
+    if (!supabase) {
       console.error('[HIERARCHICAL] Missing Supabase environment variables');
       throw new Error('Missing Supabase environment variables');
     }
 
-    const supabase = createClient(supabaseUrl, supabaseKey, {
-      auth: { persistSession: false }
-    });
-
-    // Get the transcript
+    // Get the transcript, fetching only the columns used here rather than
+    // every column of the row
     const { data: transcript, error: getError } = await supabase
       .from('transcripts')
-      .select('*')
+      .select('title, content, metadata')
       .eq('id', transcriptId)
       .single();
     
@@ -53,12 +67,53 @@ Deno.serve(async (req) => {
       console.error(`[HIERARCHICAL] Error fetching transcript ${transcriptId}:`, getError?.message || 'Not found');
       return new Response(
         JSON.stringify({ error: getError?.message || 'Transcript not found' }),
-        { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 404 }
+        { headers: jsonHeaders, status: 404 }
       );
     }
 
     console.log(`[HIERARCHICAL] Found transcript ${transcriptId}: "${transcript.title}"`);
 
+    const content = transcript.content || '';
+    
+    // Skip re-chunking when this exact content was already chunked by this
+    // function and its chunks are still stored. The hash is kept separately
+    // from process-transcript's content_hash since the two chunk differently.
+    const previousMetadata = (transcript.metadata as Record<string, any>) || {};
+    const contentHash = await hashContent(content);
+    if (previousMetadata.hierarchical_content_hash === contentHash && await hasStoredChunks(supabase!, transcriptId)) {
+      console.log(`[HIERARCHICAL] Content of transcript ${transcriptId} unchanged since last hierarchical chunking, skipping`);
+      return new Response(
+        JSON.stringify({ 
+          success: true,
+          skipped: true,
+          message: 'Transcript content unchanged since last hierarchical chunking',
+          parentChunks: previousMetadata.parent_chunks,
+          childChunks: previousMetadata.child_chunks,
+          totalChunks: previousMetadata.total_chunks
+        }),
+        { headers: jsonHeaders }
+      );
+    }
+
+    // Forget the previous run's hash before its chunks are replaced, so a run
+    // that fails partway (leaving only some chunks stored) is not mistaken
+    // for finished chunking and skipped on retry
+    if (previousMetadata.hierarchical_content_hash != null) {
+      previousMetadata.hierarchical_content_hash = null;
+      const { error: clearHashError } = await supabase
+        .from('transcripts')
+        .update({ metadata: previousMetadata })
+        .eq('id', transcriptId);
+      
+      if (clearHashError) {
+        console.error(`[HIERARCHICAL] Error clearing content hash for ${transcriptId}:`, clearHashError);
+        return new Response(
+          JSON.stringify({ error: `Failed to clear content hash: ${clearHashError.message}` }),
+          { headers: jsonHeaders, status: 500 }
+        );
+      }
+    }
+
     // Clear existing chunks
     const { error: deleteError } = await supabase
       .from('chunks')
@@ -69,98 +124,33 @@ Deno.serve(async (req) => {
       console.error(`[HIERARCHICAL] Error clearing existing chunks for ${transcriptId}:`, deleteError);
       return new Response(
         JSON.stringify({ error: `Failed to clear existing chunks: ${deleteError.message}` }),
-        { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 500 }
+        { headers: jsonHeaders, status: 500 }
       );
     }
 
     console.log(`[HIERARCHICAL] Cleared existing chunks for transcript ${transcriptId}`);
 
-    // Create parent chunks (simplified algorithm)
-    const content = transcript.content || '';
-    const paragraphs = content.split(/\n\n+/).filter(p => p.trim());
+    // Split content into paragraphs (simplified algorithm)
+    const paragraphs = content.split(PARAGRAPH_SPLIT_PATTERN).filter(p => p.trim());
     
     if (paragraphs.length === 0) {
       console.error(`[HIERARCHICAL] No content to chunk for transcript ${transcriptId}`);
       return new Response(
         JSON.stringify({ error: 'No content to chunk' }),
-        { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 400 }
+        { headers: jsonHeaders, status: 400 }
       );
     }
 
-    // Determine how many parent chunks to create (aim for ~3-5 paragraphs per parent)
-    const numParents = Math.max(3, Math.ceil(paragraphs.length / 5));
-    const parentChunks = [];
-    const allChunks = [];
-    
-    for (let i = 0; i < numParents; i++) {
-      const startIdx = Math.floor((i * paragraphs.length) / numParents);
-      const endIdx = Math.floor(((i + 1) * paragraphs.length) / numParents);
-      const parentParagraphs = paragraphs.slice(startIdx, endIdx);
-      
-      const parentContent = parentParagraphs.join('\n\n');
-      // Use proper UUIDs instead of concatenating strings
-      const parentId = uuidv4();
-      const topic = `Topic ${i + 1}`;
-      
-      // Add parent chunk
-      parentChunks.push({
-        id: parentId,
-        content: parentContent,
-        transcript_id: transcriptId,
-        chunk_type: 'parent',
-        topic: topic,
-        metadata: {
-          position: i,
-          parent_id: null,
-          chunk_strategy: 'hierarchical',
-          implementation: 'edge-function'
-        }
-      });
-      allChunks.push({
-        id: parentId,
-        content: parentContent,
-        transcript_id: transcriptId,
-        chunk_type: 'parent',
-        topic: topic,
-        metadata: {
-          position: i,
-          parent_id: null,
-          chunk_strategy: 'hierarchical',
-          implementation: 'edge-function'
-        }
-      });
-      
-      // Create child chunks by sentences
-      const sentences = parentContent.match(/[^.!?]+[.!?]+/g) || [];
-      const numChildren = Math.min(5, sentences.length);
-      
-      for (let j = 0; j < numChildren; j++) {
-        const sentence = sentences[j] ? sentences[j].trim() : `Child chunk ${j + 1} content`;
-        
-        allChunks.push({
-          id: uuidv4(), // Generate proper UUID for child chunks
-          content: sentence,
-          transcript_id: transcriptId,
-          chunk_type: 'child',
-          topic: null,
-          metadata: {
-            position: j,
-            parent_id: parentId,
-            chunk_strategy: 'hierarchical',
-            implementation: 'edge-function'
-          }
-        });
-      }
-    }
+    // Split paragraphs evenly into parent chunks with sentence children
+    const { chunks: allChunks, parentCount: numParents } = createReprocessingChunks(paragraphs, transcriptId, 'edge-function');
 
     // Insert all chunks
     if (allChunks.length > 0) {
-      // Store in batches to avoid payload limits
-      const BATCH_SIZE = 20;
+      // Store in as few multi-row inserts as the payload limits allow, with a
+      // few of them streaming at once rather than one round trip at a time
       let insertErrors = [];
       
-      for (let i = 0; i < allChunks.length; i += BATCH_SIZE) {
-        const batch = allChunks.slice(i, i + BATCH_SIZE);
+      await runWithConcurrency(iterateInsertBatches(allChunks), CHUNK_INSERT_CONCURRENCY, async (batch) => {
         const { error: insertError } = await supabase
           .from('chunks')
           .insert(batch);
@@ -169,7 +159,7 @@ Deno.serve(async (req) => {
           console.error(`[HIERARCHICAL] Error inserting chunk batch for ${transcriptId}:`, insertError);
           insertErrors.push(insertError.message);
         }
-      }
+      });
       
       if (insertErrors.length > 0) {
         return new Response(
@@ -178,7 +168,7 @@ Deno.serve(async (req) => {
             errors: insertErrors,
             message: `Failed to insert some chunks: ${insertErrors[0]}` 
           }),
-          { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 500 }
+          { headers: jsonHeaders, status: 500 }
         );
       }
     }
@@ -189,11 +179,14 @@ Deno.serve(async (req) => {
       .update({
         is_processed: true,
         metadata: {
-          ...transcript.metadata,
+          ...previousMetadata,
           hierarchical_chunking_processed_at: new Date().toISOString(),
+          hierarchical_content_hash: contentHash,
+          // The chunks process-transcript's hash referred to were replaced
+          content_hash: null,
           chunking_strategy: 'hierarchical',
-          parent_chunks: parentChunks.length,
-          child_chunks: allChunks.length - parentChunks.length,
+          parent_chunks: numParents,
+          child_chunks: allChunks.length - numParents,
           total_chunks: allChunks.length
         }
       })
@@ -203,29 +196,29 @@ Deno.serve(async (req) => {
       console.error(`[HIERARCHICAL] Error updating transcript ${transcriptId} metadata:`, updateError);
       return new Response(
         JSON.stringify({ error: `Failed to update transcript metadata: ${updateError.message}` }),
-        { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 500 }
+        { headers: jsonHeaders, status: 500 }
       );
     }
 
     console.log(`[HIERARCHICAL] Successfully processed transcript ${transcriptId} with hierarchical chunking`);
-    console.log(`[HIERARCHICAL] Created ${parentChunks.length} parent chunks and ${allChunks.length - parentChunks.length} child chunks`);
+    console.log(`[HIERARCHICAL] Created ${numParents} parent chunks and ${allChunks.length - numParents} child chunks`);
     
     return new Response(
       JSON.stringify({ 
         success: true,
         message: 'Transcript processed with hierarchical chunking',
-        parentChunks: parentChunks.length,
-        childChunks: allChunks.length - parentChunks.length,
+        parentChunks: numParents,
+        childChunks: allChunks.length - numParents,
         totalChunks: allChunks.length
       }),
-      { headers: { ...corsHeaders, 'Content-Type': 'application/json' } }
+      { headers: jsonHeaders }
     );
   } catch (error) {
     console.error('[HIERARCHICAL] Error in hierarchical chunking:', error);
     
     return new Response(
       JSON.stringify({ error: error.message || 'Internal server error' }),
-      { headers: { ...corsHeaders, 'Content-Type': 'application/json' }, status: 500 }
+      { headers: jsonHeaders, status: 500 }
     );
   }
 });
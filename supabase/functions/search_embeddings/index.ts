@@ -1,12 +1,19 @@
 
-import { serve } from 'https://deno.land/std@0.168.0/http/server.ts'
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2'
+import { jsonResponse } from '../_shared/compression.ts'
 
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 }
 
+// Environment read once per isolate rather than on every request
+const supabaseUrl = Deno.env.get('SUPABASE_URL') ?? ''
+const supabaseAnonKey = Deno.env.get('SUPABASE_ANON_KEY') ?? ''
+
+// Words too common to be useful as hybrid search keywords
+const KEYWORD_STOP_WORDS = new Set(['this', 'that', 'with', 'from', 'what', 'when', 'where', 'which', 'who'])
+
 /**
  * This function implements smarter vector search with:
  * 1. Vector similarity (cosine distance)
@@ -14,21 +21,22 @@ const corsHeaders = {
  * 3. Feedback-based relevance scoring
  * 4. Hybrid search (semantic + keyword)
  */
-serve(async (req) => {
+Deno.serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders })
   }
 
   try {
-    // Create Supabase client
-    const supabaseClient = createClient(
-      // Supabase API URL - env var exported by default.
-      Deno.env.get('SUPABASE_URL') ?? '',
-      // Supabase API ANON KEY - env var exported by default.
-      Deno.env.get('SUPABASE_ANON_KEY') ?? '',
-      { global: { headers: { Authorization: req.headers.get('Authorization')! } } }
-    )
+    // Create a Supabase client that queries as the caller, so row level
+    // security applies. It is per request because the caller's JWT is, but
+    // it never holds a session of its own, so session persistence and token
+    // refresh are switched off. All clients share the runtime's pooled
+    // fetch connections.
+    const supabaseClient = createClient(supabaseUrl, supabaseAnonKey, {
+      global: { headers: { Authorization: req.headers.get('Authorization')! } },
+      auth: { persistSession: false, autoRefreshToken: false }
+    })
 
     // Parse request data
     const requestData = await req.json()
@@ -57,12 +65,13 @@ serve(async (req) => {
       const keywords = query_text
         .toLowerCase()
         .split(/\s+/)
-        .filter(word => word.length > 3 && !['this', 'that', 'with', 'from', 'what', 'when', 'where', 'which', 'who'].includes(word))
+        .filter(word => word.length > 3 && !KEYWORD_STOP_WORDS.has(word))
         .slice(0, 5)  // Take top 5 keywords
       
       if (keywords.length > 0) {
-        // Create a plainto_tsquery expression with OR between terms
-        keywordFilter = `'${keywords.join(' | ')}'`
+        // A websearch_to_tsquery expression with OR between terms; unlike
+        // plainto_tsquery it keeps the ORs rather than requiring every term
+        keywordFilter = keywords.join(' or ')
       }
     }
 
@@ -71,83 +80,44 @@ serve(async (req) => {
     // 1. Generate embedding for the query_text
     // 2. Use vector similarity search: embedding <=> query_embedding
     
-    // Start building our SQL query
-    let query = supabaseClient.from('embeddings')
-      .select('id, content, metadata, relevance_score, feedback_count')
-      
-    // Apply text search on content
-    if (keywordFilter && use_hybrid_search) {
-      query = query.textSearch('content', keywordFilter, { 
-        type: 'plain',
-        config: 'english'
-      })
-    } else {
-      // Fall back to simple text matching if no keywords
-      query = query.textSearch('content', query_text)
-    }
-    
-    // Apply metadata filters if provided
+    // Apply metadata filters if provided, as one JSON containment check
+    // (metadata @> {...}). Keys and values travel as JSON data rather than
+    // being spliced into the filter expression, and the check can use the
+    // GIN index on metadata instead of comparing each key row by row.
+    const containedMetadata: Record<string, unknown> = {}
     if (filter_metadata) {
       const filters = typeof filter_metadata === 'string' 
         ? JSON.parse(filter_metadata) 
         : filter_metadata
-        
+      
       for (const [key, value] of Object.entries(filters)) {
         if (value) {
-          query = query.filter(`metadata->>${key}`, 'eq', value)
+          containedMetadata[key] = value
         }
       }
     }
 
-    // Apply result limits
-    query = query.limit(match_count || 10)
-      
-    // Execute the query
-    const { data, error } = await query
+    // Search the stored english tsvector of content with websearch_to_tsquery,
+    // which parses free text that to_tsquery would reject. Falls back to the
+    // query as typed when no keywords were extracted. The function scores
+    // each match (relevance, position and feedback boost), then applies the
+    // threshold, ordering and limit to that final score, so the boost decides
+    // which rows are returned and they arrive already sorted.
+    const { data: results, error } = await supabaseClient.rpc('search_embeddings_by_text', {
+      search_query: keywordFilter && use_hybrid_search ? keywordFilter : query_text,
+      filter_metadata: containedMetadata,
+      match_count: match_count || 10,
+      match_threshold: match_threshold || 0,
+      use_feedback
+    })
 
     if (error) {
       throw error
     }
-    
-    // Process and format results
-    let results = data.map((item, index) => {
-      // Calculate base score (use relevance_score if available, otherwise position-based)
-      let baseScore = item.relevance_score ?? (1.0 - (index * 0.1))
-      
-      // Clamp score between 0 and 1
-      if (baseScore < 0) baseScore = 0
-      if (baseScore > 1) baseScore = 1
-      
-      // Apply feedback boost if requested
-      let feedbackBoost = 0
-      if (use_feedback && item.feedback_count > 0) {
-        // Boost based on feedback count (max 50% boost)
-        feedbackBoost = Math.min(item.feedback_count / 10, 0.5) * baseScore
-      }
-      
-      const finalScore = Math.min(baseScore + feedbackBoost, 1.0)
-      
-      return {
-        id: item.id,
-        content: item.content,
-        metadata: item.metadata,
-        score: finalScore,
-        feedback_count: item.feedback_count || 0
-      }
-    })
-    
-    // Sort by final score
-    results = results.sort((a, b) => b.score - a.score)
-    
-    // Filter by threshold if specified
-    if (match_threshold) {
-      results = results.filter(item => item.score >= match_threshold)
-    }
 
-    // Return results
-    return new Response(JSON.stringify(results), {
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' }
-    })
+    // Return results, gzipped when large since result content dominates the
+    // bytes on the wire
+    return jsonResponse(req, results, { headers: corsHeaders })
   } catch (error) {
     console.error('Error:', error.message)
     return new Response(JSON.stringify({ error: error.message }), {
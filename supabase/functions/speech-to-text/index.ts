@@ -1,16 +1,17 @@
 
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import "https://deno.land/x/xhr@0.1.0/mod.ts";
 
 const GEMINI_API_KEY = Deno.env.get('GEMINI_API_KEY');
 const SPEECH_TO_TEXT_URL = "https://speech.googleapis.com/v1p1beta1/speech:recognize";
+// Fail instead of hanging if the API stalls
+const REQUEST_TIMEOUT_MS = 30000;
 
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 };
 
-serve(async (req) => {
+Deno.serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders });
@@ -42,6 +43,7 @@ serve(async (req) => {
     // Call Google Speech-to-Text API
     const response = await fetch(`${SPEECH_TO_TEXT_URL}?key=${GEMINI_API_KEY}`, {
       method: 'POST',
+      signal: AbortSignal.timeout(REQUEST_TIMEOUT_MS),
       headers: {
         'Content-Type': 'application/json',
       },
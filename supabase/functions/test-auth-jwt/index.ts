@@ -1,5 +1,3 @@
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
-
 const VERTEX_AI_SERVICE_ACCOUNT = Deno.env.get('VERTEX_AI_SERVICE_ACCOUNT');
 
 const corsHeaders = {
@@ -280,7 +278,7 @@ async function validateServiceAccount(serviceAccount) {
   }
 }
 
-serve(async (req) => {
+Deno.serve(async (req) => {
   console.log("=== test-auth-jwt function called ===");
   
   // Handle CORS
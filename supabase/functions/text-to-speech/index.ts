@@ -1,9 +1,10 @@
 
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import "https://deno.land/x/xhr@0.1.0/mod.ts";
 
 const GEMINI_API_KEY = Deno.env.get('GEMINI_API_KEY');
 const TEXT_TO_SPEECH_URL = "https://texttospeech.googleapis.com/v1/text:synthesize";
+// Fail instead of hanging if the API stalls
+const REQUEST_TIMEOUT_MS = 30000;
 
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
@@ -29,7 +30,7 @@ function prepareTextForSpeech(text: string): string {
     .trim();
 }
 
-serve(async (req) => {
+Deno.serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
     return new Response(null, { headers: corsHeaders });
@@ -70,6 +71,7 @@ serve(async (req) => {
     // Call Google Text-to-Speech API
     const response = await fetch(`${TEXT_TO_SPEECH_URL}?key=${GEMINI_API_KEY}`, {
       method: 'POST',
+      signal: AbortSignal.timeout(REQUEST_TIMEOUT_MS),
       headers: {
         'Content-Type': 'application/json',
       },
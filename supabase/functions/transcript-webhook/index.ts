@@ -7,12 +7,20 @@ const supabaseAdmin = createClient(
   Deno.env.get('SUPABASE_SERVICE_ROLE_KEY') ?? ''
 )
 
+// Supabase edge runtime global used to run work after the response is sent
+declare const EdgeRuntime: { waitUntil(promise: Promise<unknown>): void };
+
 // Define CORS headers for browser requests
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
 }
 
+// Headers for JSON responses, built once per isolate rather than per response
+const jsonHeaders = { ...corsHeaders, 'Content-Type': 'application/json' }
+
+const DEBUG_LOGGING = Deno.env.get('DEBUG_LOGGING') === 'true';
+
 Deno.serve(async (req) => {
   // Handle CORS preflight requests
   if (req.method === 'OPTIONS') {
@@ -31,14 +39,18 @@ Deno.serve(async (req) => {
         timestamp: new Date().toISOString()
       }), { 
         status: 200,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
     const { record, type } = payload;
     
     console.log(`[WEBHOOK] Received event: ${type} for transcript ID ${record?.id || 'unknown'}`);
-    console.log(`[WEBHOOK] Full record data:`, JSON.stringify(record, null, 2));
+    // The record can carry the full transcript content, so it is only
+    // serialized into the logs when DEBUG_LOGGING is enabled
+    if (DEBUG_LOGGING) {
+      console.debug(`[WEBHOOK] Full record data:`, JSON.stringify(record));
+    }
     
     // Handle n8n processing completion
     if (type === 'N8N_PROCESSING_COMPLETE') {
@@ -60,14 +72,14 @@ Deno.serve(async (req) => {
         console.error('[WEBHOOK] Error updating transcript after n8n processing:', updateError);
         return new Response(JSON.stringify({ error: updateError.message }), { 
           status: 500,
-          headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+          headers: jsonHeaders
         });
       }
       
       console.log(`[WEBHOOK] Successfully updated transcript ${record.id} after n8n processing`);
       return new Response(JSON.stringify({ success: true, message: 'n8n processing completed' }), { 
         status: 200,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
@@ -130,7 +142,7 @@ Deno.serve(async (req) => {
         error: `Failed to fetch transcript: ${fetchError.message}` 
       }), { 
         status: 404,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
       
@@ -140,7 +152,7 @@ Deno.serve(async (req) => {
         error: 'Transcript not found in database'
       }), { 
         status: 404,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+        headers: jsonHeaders
       });
     }
     
@@ -165,55 +177,65 @@ Deno.serve(async (req) => {
       console.log(`[WEBHOOK] Successfully marked transcript ${record.id} as in processing`);
     }
     
-    // Call the process-transcript function to start processing
+    // Hand the process-transcript call to the runtime and respond right away,
+    // rather than holding this request (and the caller's) open until chunking
+    // finishes. Invocation failures are still recorded on the transcript.
     console.log(`[WEBHOOK] Invoking process-transcript function for transcript ${record.id}`);
-    const { data, error } = await supabaseAdmin.functions.invoke('process-transcript', {
-      body: { transcript_id: record.id }
-    });
-    
-    if (error) {
-      console.error('[WEBHOOK] Error invoking process-transcript function:', error);
-      
-      // Try to mark the transcript as processed with error
-      try {
-        console.log(`[WEBHOOK] Marking transcript ${record.id} as failed due to invocation error`);
-        await supabaseAdmin
-          .from('transcripts')
-          .update({ 
-            is_processed: true,
-            metadata: { 
-              ...transcript.metadata,
-              processing_completed_at: new Date().toISOString(),
-              processing_error: `Failed to invoke processing: ${error.message}`,
-              processing_failed: true
-            } 
-          })
-          .eq('id', record.id);
-      } catch (markError) {
-        console.error('[WEBHOOK] Failed to mark transcript as failed:', markError);
-      }
-      
-      return new Response(JSON.stringify({ error: error.message }), { 
-        status: 500,
-        headers: { ...corsHeaders, 'Content-Type': 'application/json' }
-      });
-    }
-    
-    console.log(`[WEBHOOK] Successfully invoked process-transcript for ${record.id}, response:`, data);
+    EdgeRuntime.waitUntil(invokeProcessTranscript(record.id, transcript.metadata));
     
     return new Response(JSON.stringify({ 
       success: true, 
-      message: 'Processing initiated',
-      data
+      message: 'Processing initiated'
     }), { 
-      status: 200,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+      status: 202,
+      headers: jsonHeaders
     });
   } catch (error) {
     console.error('[WEBHOOK] Error in transcript-webhook function:', error);
     return new Response(JSON.stringify({ error: error.message }), { 
       status: 500,
-      headers: { ...corsHeaders, 'Content-Type': 'application/json' }
+      headers: jsonHeaders
     });
   }
 })
+
+// Invoke process-transcript and mark the transcript as failed if the call errors.
+// An invocation that throws is handled like one that returns an error, and a
+// failed mark is reported separately.
+async function invokeProcessTranscript(transcriptId: string, metadata: Record<string, any> | null) {
+  let invokeError;
+  try {
+    const { data, error } = await supabaseAdmin.functions.invoke('process-transcript', {
+      body: { transcript_id: transcriptId }
+    });
+    
+    if (!error) {
+      console.log(`[WEBHOOK] Successfully invoked process-transcript for ${transcriptId}, response:`, data);
+      return;
+    }
+    invokeError = error;
+  } catch (error) {
+    invokeError = error;
+  }
+  
+  console.error('[WEBHOOK] Error invoking process-transcript function:', invokeError);
+  console.log(`[WEBHOOK] Marking transcript ${transcriptId} as failed due to invocation error`);
+  try {
+    const { error: markError } = await supabaseAdmin
+      .from('transcripts')
+      .update({ 
+        is_processed: true,
+        metadata: { 
+          ...metadata,
+          processing_completed_at: new Date().toISOString(),
+          processing_error: `Failed to invoke processing: ${invokeError?.message ?? String(invokeError)}`,
+          processing_failed: true
+        } 
+      })
+      .eq('id', transcriptId);
+    
+    if (markError) throw markError;
+  } catch (markError) {
+    console.error('[WEBHOOK] Failed to mark transcript as failed:', markError);
+  }
+}
@@ -1,6 +1,16 @@
 
 import { createClient } from "https://esm.sh/@supabase/supabase-js@2.39.6";
 
+// Create the service-role client once per isolate so warm invocations
+// reuse its connections instead of building a new client per request
+const supabaseUrl = Deno.env.get('SUPABASE_URL');
+const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+const supabase = supabaseUrl && supabaseKey
+  ? createClient(supabaseUrl, supabaseKey, {
+      auth: { persistSession: false }
+    })
+  : null;
+
 const corsHeaders = {
   'Access-Control-Allow-Origin': '*',
   'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
@@ -25,19 +35,11 @@ Deno.serve(async (req) => {
 
     console.log(`[PROCESS] Received request to process transcript ${id}`);
 
-    // Create Supabase client
-    const supabaseUrl = Deno.env.get('SUPABASE_URL');
-    const supabaseKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
-    
-    if (!supabaseUrl || !supabaseKey) {
+    if (!supabase) {
       console.error('[PROCESS] Missing Supabase environment variables');
       throw new Error('Missing Supabase environment variables');
     }
 
-    const supabase = createClient(supabaseUrl, supabaseKey, {
-      auth: { persistSession: false }
-    });
-
     // Get the transcript
     const { data: transcript, error: getError } = await supabase
       .from('transcripts')
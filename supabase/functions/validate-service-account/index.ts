@@ -1,6 +1,4 @@
 
-import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
-
 const VERTEX_AI_SERVICE_ACCOUNT = Deno.env.get('VERTEX_AI_SERVICE_ACCOUNT');
 const VERTEX_LOCATION = "us-central1";
 // Set model ID based on documentation for Vertex AI API
@@ -510,7 +508,7 @@ async function testJwtCreation(serviceAccountJSON) {
   }
 }
 
-serve(async (req) => {
+Deno.serve(async (req) => {
   // Log start of request for debugging
   console.log("=== validate-service-account function called ===");
   
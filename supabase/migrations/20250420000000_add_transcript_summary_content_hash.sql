@@ -0,0 +1,9 @@
+-- Migration script for caching transcript summaries by content
+
+-- SHA-256 of the summarized transcript content, written by generate-transcript-summary
+ALTER TABLE public.transcript_summaries ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN public.transcript_summaries.content_hash IS 'SHA-256 (hex) of the transcript content the summary was generated from; identical content reuses the summary.';
+
+-- Index for the content hash lookup made before generating a new summary
+CREATE INDEX IF NOT EXISTS idx_transcript_summaries_content_hash ON public.transcript_summaries(content_hash);
@@ -0,0 +1,8 @@
+-- Migration script for indexing the transcript upload duplicate check
+
+-- The uploader looks for an existing transcript with
+-- file_path LIKE '%<filename>%'; a leading wildcard cannot use a btree index,
+-- so without a trigram index every upload scans the whole transcripts table
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_transcripts_file_path_trgm ON public.transcripts USING gin (file_path gin_trgm_ops);
@@ -0,0 +1,11 @@
+-- Migration script for deferring chunk search index maintenance during bulk writes
+
+-- Re-chunking a transcript deletes its chunks and inserts hundreds of new
+-- rows in multi-row batches. With the trigram GIN index updated entry by
+-- entry, every inserted row pays for its own posting-list updates. Fast
+-- update queues new entries in the index's pending list and merges them
+-- into the main structure in bulk (on vacuum/analyze or once the list
+-- fills), so index building is separated from the insert itself. The larger
+-- pending list (16MB, default 4MB) lets a whole bulk re-chunk fit before a
+-- merge is forced.
+ALTER INDEX IF EXISTS public.idx_chunks_content_trgm SET (fastupdate = on, gin_pending_list_limit = 16384);
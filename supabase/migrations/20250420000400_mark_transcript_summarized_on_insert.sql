@@ -0,0 +1,23 @@
+-- Migration script for flagging transcripts as summarized in the summary insert
+
+-- generate-transcript-summary used to insert the summary row and then make a
+-- second request to set transcripts.is_summarized. Setting the flag from a
+-- trigger lands both writes in the same statement and transaction, so the
+-- flag can no longer be left unset after a successful insert.
+CREATE OR REPLACE FUNCTION public.mark_transcript_summarized()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE public.transcripts
+  SET is_summarized = true
+  WHERE id = NEW.transcript_id
+    AND is_summarized IS DISTINCT FROM true;
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_mark_transcript_summarized ON public.transcript_summaries;
+CREATE TRIGGER trigger_mark_transcript_summarized
+  AFTER INSERT ON public.transcript_summaries
+  FOR EACH ROW
+  EXECUTE FUNCTION public.mark_transcript_summarized();
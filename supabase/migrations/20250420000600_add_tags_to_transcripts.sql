@@ -0,0 +1,30 @@
+-- Migration script for applying tags to many transcripts in one statement
+
+-- Bulk tagging used to send one UPDATE per selected transcript, so tagging N
+-- transcripts cost N round trips. This function merges the new tags into
+-- every selected transcript in a single UPDATE. Existing tags keep their
+-- order and new ones are appended once, matching the client's previous
+-- [...new Set([...currentTags, ...newTags])]. It runs as the caller, so row
+-- level security still decides which transcripts can be changed, and it
+-- returns the IDs that were actually updated.
+CREATE OR REPLACE FUNCTION public.add_tags_to_transcripts(
+  transcript_ids UUID[],
+  new_tags TEXT[]
+)
+RETURNS SETOF UUID
+LANGUAGE sql
+AS $$
+  UPDATE public.transcripts t
+  SET tags = (
+    SELECT COALESCE(array_agg(tag ORDER BY first_position), '{}')
+    FROM (
+      SELECT tag, min(position) AS first_position
+      FROM unnest(COALESCE(t.tags, '{}') || new_tags) WITH ORDINALITY AS u(tag, position)
+      GROUP BY tag
+    ) merged
+  )
+  WHERE t.id = ANY(transcript_ids)
+  RETURNING t.id;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.add_tags_to_transcripts(UUID[], TEXT[]) TO authenticated;
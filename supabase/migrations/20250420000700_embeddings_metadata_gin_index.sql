@@ -0,0 +1,8 @@
+-- Migration script for indexing embeddings metadata filters
+
+-- search_embeddings applies metadata filters as a single JSON containment
+-- check (metadata @> '{"key": "value"}'). jsonb_path_ops indexes exactly
+-- that operator, and more compactly than the default jsonb_ops, so filtered
+-- searches no longer have to inspect every row's metadata.
+CREATE INDEX IF NOT EXISTS idx_embeddings_metadata_path_ops
+  ON public.embeddings USING gin (metadata jsonb_path_ops);
@@ -0,0 +1,32 @@
+-- Migration script for storing full-text search vectors alongside content
+
+-- Full-text searches on embeddings and chunks matched against the content
+-- column, so Postgres ran to_tsvector over every candidate row's text on
+-- each query, and neither table had an index that could answer the match.
+-- Each table now keeps an english tsvector of its content in a generated
+-- column, computed once when a row is written, with a GIN index on it.
+-- Searches filter on content_tsv with english queries, which matches the
+-- same rows as before without re-tokenizing any content.
+-- public.embeddings belongs to the external vector store and is not created
+-- by these migrations, so it is only altered when it already exists.
+DO $$
+BEGIN
+  IF to_regclass('public.embeddings') IS NOT NULL THEN
+    ALTER TABLE public.embeddings
+      ADD COLUMN IF NOT EXISTS content_tsv tsvector
+      GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+
+    CREATE INDEX IF NOT EXISTS idx_embeddings_content_tsv
+      ON public.embeddings USING gin (content_tsv);
+  END IF;
+END $$;
+
+ALTER TABLE public.chunks
+  ADD COLUMN IF NOT EXISTS content_tsv tsvector
+  GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+
+-- Chunks are rewritten in bulk on re-chunking, so this index queues new
+-- entries the same way idx_chunks_content_trgm does
+CREATE INDEX IF NOT EXISTS idx_chunks_content_tsv
+  ON public.chunks USING gin (content_tsv)
+  WITH (fastupdate = on, gin_pending_list_limit = 16384);
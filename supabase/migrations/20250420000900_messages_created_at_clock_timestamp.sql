@@ -0,0 +1,8 @@
+-- Migration script for ordering messages written in the same statement
+
+-- Each chat exchange (question and reply) is saved in one multi-row insert.
+-- now() is fixed for the whole transaction, so both rows would share one
+-- created_at and their order would be undefined. clock_timestamp() is read
+-- as each row is built, so rows inserted together are stamped in the order
+-- they were sent, by the database clock rather than the browser's.
+ALTER TABLE public.messages ALTER COLUMN created_at SET DEFAULT clock_timestamp();
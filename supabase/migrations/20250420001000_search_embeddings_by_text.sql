@@ -0,0 +1,79 @@
+-- Migration script for ranking embeddings text search results in SQL
+
+-- search_embeddings used to fetch match_count full-text matches in no
+-- particular order and only then apply the feedback boost, so the boost
+-- never decided which rows were returned. This function computes each
+-- match's final score and applies the threshold, ordering and limit to
+-- that score, so the best boosted rows are the ones returned.
+--
+-- The score is the same as before:
+--   base  = relevance_score, or 1 - 0.1 per position when a row has none
+--           (positions now follow ts_rank_cd instead of arbitrary order),
+--           clamped to [0, 1]
+--   final = min(base + min(feedback_count / 10, 0.5) * base, 1)
+-- It runs as the caller, so row level security still applies. plpgsql is
+-- used because public.embeddings belongs to the external vector store and
+-- may not exist yet when migrations run; the body is only checked on call.
+CREATE OR REPLACE FUNCTION public.search_embeddings_by_text(
+  search_query TEXT,
+  filter_metadata JSONB DEFAULT '{}'::jsonb,
+  match_count INT DEFAULT 10,
+  match_threshold DOUBLE PRECISION DEFAULT 0,
+  use_feedback BOOLEAN DEFAULT true
+)
+RETURNS TABLE (
+  id UUID,
+  content TEXT,
+  metadata JSONB,
+  feedback_count INT,
+  score DOUBLE PRECISION
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+#variable_conflict use_column
+BEGIN
+  RETURN QUERY
+  WITH matches AS (
+    SELECT
+      e.id,
+      e.content,
+      e.metadata,
+      COALESCE(e.feedback_count, 0)::INT AS feedback_count,
+      e.relevance_score::DOUBLE PRECISION AS relevance_score,
+      row_number() OVER (ORDER BY ts_rank_cd(e.content_tsv, q.query) DESC) AS text_position
+    FROM public.embeddings e,
+      websearch_to_tsquery('english', search_query) AS q(query)
+    WHERE e.content_tsv @@ q.query
+      AND e.metadata @> COALESCE(filter_metadata, '{}'::jsonb)
+  ),
+  based AS (
+    SELECT
+      m.*,
+      LEAST(GREATEST(COALESCE(m.relevance_score, 1.0 - (m.text_position - 1) * 0.1), 0), 1) AS base_score
+    FROM matches m
+  ),
+  scored AS (
+    SELECT
+      b.id,
+      b.content,
+      b.metadata,
+      b.feedback_count,
+      LEAST(
+        b.base_score + CASE
+          WHEN use_feedback AND b.feedback_count > 0 THEN LEAST(b.feedback_count / 10.0, 0.5) * b.base_score
+          ELSE 0
+        END,
+        1
+      )::DOUBLE PRECISION AS final_score
+    FROM based b
+  )
+  SELECT s.id, s.content, s.metadata, s.feedback_count, s.final_score
+  FROM scored s
+  WHERE s.final_score >= COALESCE(match_threshold, 0)
+  ORDER BY s.final_score DESC
+  LIMIT match_count;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_embeddings_by_text(TEXT, JSONB, INT, DOUBLE PRECISION, BOOLEAN) TO anon, authenticated;